@@ -1,61 +1,146 @@
 # main.py
 import os
+
+# Read (and strip) the token exactly once, then drop it from the process
+# environment so children and /proc/self/environ can't leak it.
+TOKEN = (os.environ.pop("DISCORD_TOKEN", "") or "").strip() or None
+if __name__ == "__main__" and not TOKEN:
+    # Fail fast before paying the discord/aiohttp import cost (hundreds of
+    # ms and tens of MB RSS) on a restart loop that can never succeed.
+    raise SystemExit("Missing DISCORD_TOKEN in environment.")
+
 import asyncio
+import hashlib
+import json
 import logging
+import queue
+import signal
+import sys
+from logging.handlers import QueueHandler, QueueListener
 
 import discord
 from discord.ext import commands
 
 from weather_store import WxStore
 
-TOKEN = os.getenv("DISCORD_TOKEN")
-APP_ID = os.getenv("DISCORD_APP_ID")  # optional; if set we'll pass to the Bot
+# uvloop is a drop-in libuv event loop: lower syscall overhead for the
+# gateway websocket + HTTP traffic. Optional, and not available on Windows.
+if sys.platform != "win32":
+    try:
+        import uvloop
+        uvloop.install()
+    except ImportError:
+        pass
 
-logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+APP_ID = os.getenv("DISCORD_APP_ID")  # optional; if set we'll pass to the Bot
+# Resolve once at import time; passing application_id up front lets
+# discord.py skip the /applications/@me fetch during login.
+APP_ID_INT = int(APP_ID) if APP_ID and APP_ID.isdigit() else None
+
+def _setup_logging() -> QueueListener:
+    """Route all logging through a queue so emit() never blocks the loop.
+
+    The stderr write+flush happens on the listener's background thread;
+    log calls from coroutines are just an enqueue.
+    """
+    # str.format-style is parsed once by Formatter instead of %-substitution
+    # per record. Log *calls* should still use lazy %-args
+    # (log.info("... %s", x)) so formatting is skipped for filtered levels.
+    handler = logging.StreamHandler()
+    handler.setFormatter(logging.Formatter("{asctime} {levelname} {name}: {message}", style="{"))
+    q = queue.SimpleQueue()
+    root = logging.getLogger()
+    root.setLevel(logging.INFO)
+    root.addHandler(QueueHandler(q))
+    listener = QueueListener(q, handler)
+    listener.start()
+    return listener
+
+
+_log_listener = _setup_logging()
 log = logging.getLogger("wxbot")
 
-intents = discord.Intents.default()  # no message content needed for slash commands
+# Allowlist instead of Intents.default(): slash commands need only GUILDS,
+# plus DM messages so the owner-only !sync works (DM content is exempt from
+# the message-content intent). Every extra intent is gateway JSON we'd
+# parse and discard — TYPING_START alone is very chatty on busy guilds.
+INTENTS = discord.Intents(guilds=True, dm_messages=True)
+
+EXTENSIONS = ("weather",)
 
 
 class WxBot(commands.Bot):
-    async def setup_hook(self) -> None:
-        # Load extensions here (runs at the right time for app commands)
-        await self.load_extension("weather")
+    def _command_hash(self) -> str:
+        """Stable digest of the local command tree, for change detection."""
+        payload = sorted((c.to_dict(self.tree) for c in self.tree.get_commands()), key=lambda d: d["name"])
+        return hashlib.md5(json.dumps(payload, sort_keys=True).encode()).hexdigest()
 
-        # Sync app commands after login/application_id is available
-        try:
-            synced = await self.tree.sync()
-            log.info("Synced %d app commands globally.", len(synced))
-        except Exception:
-            log.exception("Failed to sync app commands.")
+    async def setup_hook(self) -> None:
+        # Load extensions here (runs at the right time for app commands).
+        # gather overlaps any I/O the extensions' setup() coroutines do.
+        await asyncio.gather(*(self.load_extension(name) for name in EXTENSIONS))
+        # Note: no automatic tree.sync() here. Commands rarely change but
+        # reconnects/restarts are frequent, so syncing is owner-triggered
+        # via the !sync text command below.
 
 
 async def main():
     if not TOKEN:
         raise SystemExit("Missing DISCORD_TOKEN in environment.")
 
-    bot_kwargs = dict(intents=intents)
-    if APP_ID:
-        try:
-            bot_kwargs["application_id"] = int(APP_ID)
-        except ValueError:
-            log.warning("DISCORD_APP_ID is set but not an int; ignoring.")
-
-    bot = WxBot(command_prefix="!", **bot_kwargs)
+    if APP_ID and APP_ID_INT is None:
+        log.warning("DISCORD_APP_ID is set but not an int; ignoring.")
 
-    # Attach store to bot so cogs can use it
-    bot.store = WxStore(os.getenv("WXBOT_DB_PATH", "data/wxbot.sqlite3"))
+    bot = WxBot(
+        command_prefix="!",
+        intents=INTENTS,
+        application_id=APP_ID_INT,
+        max_messages=None,  # slash-only bot: don't cache messages
+        chunk_guilds_at_startup=False,  # we never iterate members
+        member_cache_flags=discord.MemberCacheFlags.none(),  # nor cache them
+        help_command=None,  # only prefix command is the owner-only !sync
+    )
 
     @bot.event
     async def on_ready():
         log.info("Logged in as %s (%s)", bot.user, bot.user.id)
 
-    async with bot:
-        await bot.start(TOKEN)
+    @bot.command(name="sync")
+    @commands.is_owner()
+    async def sync_cmd(ctx: commands.Context):
+        """Owner-only: push the app command tree to Discord (run after deploys)."""
+        h = bot._command_hash()
+        if await asyncio.to_thread(bot.store.get_kv, "cmd_hash") == h:
+            return await ctx.reply("Commands unchanged since last sync.")
+        synced = await bot.tree.sync()
+        await asyncio.to_thread(bot.store.set_kv, "cmd_hash", h)
+        await ctx.reply(f"Synced {len(synced)} app commands.")
+
+    # Close cleanly on SIGTERM (docker stop / systemd) so the gateway gets
+    # a CLOSE frame and SQLite checkpoints its WAL instead of recovering
+    # on the next startup.
+    def _request_shutdown():
+        log.info("SIGTERM received; shutting down.")
+        asyncio.create_task(bot.close())
+
+    try:
+        asyncio.get_running_loop().add_signal_handler(signal.SIGTERM, _request_shutdown)
+    except (NotImplementedError, RuntimeError):
+        pass  # platforms without loop signal handlers (e.g. Windows)
+
+    # Attach store to bot so cogs can use it; the context manager opens
+    # the connection off the loop and guarantees close on shutdown.
+    async with WxStore(os.getenv("WXBOT_DB_PATH", "data/wxbot.sqlite3")) as store:
+        bot.store = store
+        async with bot:
+            await bot.start(TOKEN)
 
 
 if __name__ == "__main__":
     try:
-        asyncio.run(main())
+        with asyncio.Runner() as runner:
+            runner.run(main())
     except KeyboardInterrupt:
         pass
+    finally:
+        _log_listener.stop()
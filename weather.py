@@ -4,9 +4,25 @@ import re
 import html
 import json
 import aiohttp
+
+# orjson parses the ~20 KB Open-Meteo payloads several times faster than
+# stdlib json; fall back silently when it isn't installed.
+try:
+    import orjson
+    _loads = orjson.loads
+except ImportError:
+    _loads = json.loads
 import asyncio
-from datetime import datetime, timedelta, timezone
-from typing import Optional, Dict, Any, List, Tuple
+import heapq
+import sys
+import time
+from bisect import bisect_left, bisect_right
+from itertools import accumulate
+from collections import OrderedDict
+from functools import lru_cache
+from datetime import date, datetime, timedelta, timezone
+from typing import Optional, Dict, Any, List, NamedTuple, Tuple
+from urllib.parse import urlencode
 
 from astral import moon
 
@@ -16,9 +32,28 @@ from discord import app_commands
 
 # ---- Constants & styling helpers ----
 DEFAULT_TZ_NAME = "America/Chicago"
+
+class _Units(NamedTuple):
+    temp: str
+    wind: str
+    precip: str
+    deg: str
+
+# Every units-derived string, baked once; callers do one dict lookup
+# instead of rebuilding the four-line ladder per request.
+_UNITS = {
+    "standard": _Units("fahrenheit", "mph", "inch", "°F"),
+    "metric": _Units("celsius", "kmh", "mm", "°C"),
+}
+
+def _units_for(units: str) -> _Units:
+    return _UNITS.get((units or "standard").lower(), _UNITS["standard"])
+
 HTTP_HEADERS = {
     "User-Agent": "UtilaBot/1.0 (+https://github.com/ethanocurtis/Utilabot)",
     "Accept": "application/json",
+    # ask for compressed JSON explicitly; aiohttp auto-decompresses
+    "Accept-Encoding": "gzip, deflate",
 }
 # ---- Feedback routing (set via env) ----
 BOT_OWNER_ID = int(os.getenv("BOT_OWNER_ID", "0") or 0)  # your Discord user id
@@ -61,7 +96,7 @@ WX_CODE_MAP = {
 # ---- Moon phase helpers (Astral) ----
 # Astral's moon.phase() returns a number on ~0..28 scale for the given date.
 # We'll map that to 8 familiar phases for display.
-_MOON_PHASES_8 = [
+_MOON_PHASES_8 = (
     ("New Moon", "🌑"),
     ("Waxing Crescent", "🌒"),
     ("First Quarter", "🌓"),
@@ -70,40 +105,68 @@ _MOON_PHASES_8 = [
     ("Waning Gibbous", "🌖"),
     ("Last Quarter", "🌗"),
     ("Waning Crescent", "🌘"),
-]
+)
+
+def _phase_idx(p: float) -> int:
+    """Map Astral's 0..~28 phase value onto the 8-phase display table."""
+    # table length is a power of two, so the wrap is a bitmask
+    return int((p / 28.0) * 8 + 0.5) & 7
+
+@lru_cache(maxsize=512)
+def _moon_info_for_ordinal(ordinal: int) -> Tuple[str, str, float]:
+    # astral does real astronomical math; pure in the date, so pay it
+    # once per distinct day per process
+    p = float(moon.phase(date.fromordinal(ordinal)))  # 0..~28
+    name, emoji = _MOON_PHASES_8[_phase_idx(p)]
+    return name, emoji, round(p, 1)
 
 def moon_phase_info_for_date(d: datetime) -> Tuple[str, str, float]:
     """Return (name, emoji, age_days) for the date in d (local date is used)."""
-    # Use local date component
-    date = d.date()
-    p = float(moon.phase(date))  # 0..~28
-    idx = int((p / 28.0) * 8 + 0.5) % 8
-    name, emoji = _MOON_PHASES_8[idx]
-    age_days = round(p, 1)
-    return name, emoji, age_days
+    return _moon_info_for_ordinal(d.date().toordinal())
+# Dense table over the 0-99 WMO code range: lookup is a single C-level
+# list index instead of dict hashing (and no int() cast; Open-Meteo
+# already delivers ints).
+_WX_DEFAULT = ("\U0001F321\ufe0f", "Weather")
+_WX_TABLE = [_WX_DEFAULT] * 100
+for _k, _v in WX_CODE_MAP.items():
+    _WX_TABLE[_k] = _v
+
 def wx_icon_desc(code: int):
-    icon, desc = WX_CODE_MAP.get(int(code), ("\U0001F321\ufe0f", "Weather"))
-    return icon, desc
+    try:
+        return _WX_TABLE[code] if 0 <= code < 100 else _WX_DEFAULT
+    except TypeError:
+        return _WX_DEFAULT
+
+# Sorted thresholds + matching colour objects, built once; per-call cost
+# is a single bisect instead of a branch ladder and from_rgb allocation.
+_TEMP_THRESHOLDS = (32, 45, 60, 75, 85, 95)
+_TEMP_COLOURS = tuple(discord.Colour.from_rgb(*rgb) for rgb in (
+    (80, 150, 255),
+    (100, 180, 255),
+    (120, 200, 200),
+    (255, 205, 120),
+    (255, 160, 80),
+    (255, 120, 80),
+    (230, 60, 60),
+))
 
 def wx_color_from_temp_f(temp_f: float):
     if temp_f is None:
         return discord.Colour.blurple()
-    t = float(temp_f)
-    if t <= 32:   return discord.Colour.from_rgb(80, 150, 255)
-    if t <= 45:   return discord.Colour.from_rgb(100, 180, 255)
-    if t <= 60:   return discord.Colour.from_rgb(120, 200, 200)
-    if t <= 75:   return discord.Colour.from_rgb(255, 205, 120)
-    if t <= 85:   return discord.Colour.from_rgb(255, 160, 80)
-    if t <= 95:   return discord.Colour.from_rgb(255, 120, 80)
-    return discord.Colour.from_rgb(230, 60, 60)
+    return _TEMP_COLOURS[bisect_left(_TEMP_THRESHOLDS, float(temp_f))]
 
 def fmt_sun(dt_str: str):
+    # Open-Meteo always sends "YYYY-MM-DDTHH:MM"; slicing the hour/minute
+    # out directly skips a datetime allocation + strftime per field.
     try:
-        dt = datetime.fromisoformat(dt_str)
-        return dt.strftime("%I:%M %p")
+        h = int(dt_str[11:13])
+        ampm = "AM" if h < 12 else "PM"
+        h = h % 12 or 12
+        return f"{h:02d}:{dt_str[14:16]} {ampm}"
     except Exception:
         try:
-            return f"{dt_str[11:13]}:{dt_str[14:16]}"
+            dt = datetime.fromisoformat(dt_str)
+            return dt.strftime("%I:%M %p")
         except Exception:
             return dt_str
 
@@ -113,15 +176,25 @@ try:
 except Exception:
     ZoneInfo = None
 
+if ZoneInfo is not None:
+    @lru_cache(maxsize=64)
+    def _zoneinfo_cached(tz_name: str):
+        """ZoneInfo objects are invariant; build each name at most once."""
+        return ZoneInfo(tz_name)
+
+@lru_cache(maxsize=8)
+def _fallback_chicago_offset(year: int, is_dst: bool):
+    return timezone(timedelta(hours=-5 if is_dst else -6))
+
 def _tzinfo_from_name(tz_name: str):
     """Best-effort tzinfo for an IANA tz name. Falls back to DEFAULT_TZ_NAME."""
     tz_name = (tz_name or "").strip() or DEFAULT_TZ_NAME
     if ZoneInfo is not None:
         try:
-            return ZoneInfo(tz_name)
+            return _zoneinfo_cached(tz_name)
         except Exception:
             try:
-                return ZoneInfo(DEFAULT_TZ_NAME)
+                return _zoneinfo_cached(DEFAULT_TZ_NAME)
             except Exception:
                 pass
     # Fallback manual DST calc for America/Chicago only
@@ -132,7 +205,7 @@ def _tzinfo_from_name(tz_name: str):
     nov1 = datetime(y, 11, 1)
     first_sun_nov = nov1 + timedelta(days=(6 - nov1.weekday()) % 7)
     is_dst = second_sun_march <= dt_naive < first_sun_nov
-    return timezone(timedelta(hours=-5 if is_dst else -6))
+    return _fallback_chicago_offset(y, is_dst)
 
 def _get_user_tz_name(store, user_id: int) -> str:
     if store is None:
@@ -147,9 +220,40 @@ def _get_user_units(store, user_id: int) -> str:
     u = (store.get_note(int(user_id), "wx_units") or "standard").strip().lower()
     return u if u in {"standard", "metric"} else "standard"
 
+# ZIP sanitization: deletion table for str.translate — a straight C loop,
+# no regex state machine, for every interaction that takes a ZIP. Keeps
+# ASCII 0-9 only; translate can't delete code points >= 256, so anything
+# exotic that survives (e.g. Arabic-Indic digits) is rejected below.
+_NON_DIGIT = str.maketrans("", "", "".join(chr(c) for c in range(256) if not "0" <= chr(c) <= "9"))
+
+def _clean_zip(raw: Any) -> str:
+    """Strip a user-supplied ZIP down to ASCII digits.
+
+    Returns "" when non-ASCII digit-likes remain after the strip, so the
+    call sites' len(z) != 5 checks reject them with the friendly message
+    instead of persisting a junk ZIP.
+    """
+    z = str(raw).translate(_NON_DIGIT)
+    return z if z.isascii() and z.isdecimal() else ""
+
+_TIME_COLON_RE = re.compile(r"^(\d{1,2}):(\d{2})(am|pm)?$")
+_TIME_PLAIN_RE = re.compile(r"^(\d{2})(\d{2})(am|pm)?$")
+
+def _first(d: Dict[str, Any], key: str):
+    """First element of a daily array, or None — without the `or [None]`
+    intermediate list every lookup used to allocate."""
+    v = d.get(key)
+    return v[0] if v else None
+
+def _now_local(store, user_id: int):
+    """One call for the (now, tz, tz_name) triple the commands all need."""
+    tz_name = _get_user_tz_name(store, user_id)
+    tz = _tzinfo_from_name(tz_name)
+    return datetime.now(tz), tz, tz_name
+
 def _parse_time(time_str: str):
     t = time_str.strip().lower().replace(" ", "")
-    m = re.match(r"^(\d{1,2}):(\d{2})(am|pm)?$", t) or re.match(r"^(\d{2})(\d{2})(am|pm)?$", t)
+    m = (_TIME_COLON_RE if ":" in t else _TIME_PLAIN_RE).match(t)
     if not m:
         raise ValueError("Time must be HH:MM (24h), HHMM, or h:mma/pm.")
     hh, mi, ampm = m.groups()
@@ -167,58 +271,121 @@ def _next_local_run(now_local: datetime, hh: int, mi: int, cadence: str) -> date
     return target
 
 def _fmt_local(dt_utc: datetime, tz_name: str):
-    return dt_utc.astimezone(_tzinfo_from_name(tz_name)).strftime("%m-%d-%Y %H:%M %Z")
+    # f-string field formatting instead of strftime's per-call format-string
+    # walk; output matches the old "%m-%d-%Y %H:%M %Z" exactly.
+    d = dt_utc.astimezone(_tzinfo_from_name(tz_name))
+    return f"{d.month:02d}-{d.day:02d}-{d.year} {d.hour:02d}:{d.minute:02d} {d.tzname() or ''}"
+
+# In-flight request coalescing: when N callers (scheduler fan-out, mostly)
+# ask for the same URL+params at once, they share one HTTP round-trip.
+_INFLIGHT: Dict[str, "asyncio.Future"] = {}
+
+# Short-lived response cache behind the coalescer. Open-Meteo refreshes
+# at most every 15 minutes, so identical requests within 5 minutes (users
+# in the same city, back-to-back commands) reuse the parsed payload.
+# LRU-capped so the key space can't grow without bound.
+_JSON_TTL = 300.0
+_JSON_CACHE: "OrderedDict[str, Tuple[Any, float]]" = OrderedDict()
+
+async def _get_json(session: aiohttp.ClientSession, url: str, params: Dict[str, Any], timeout_s: float = 15):
+    key = url + "?" + urlencode(sorted((k, str(v)) for k, v in params.items()))
+    hit = _JSON_CACHE.get(key)
+    if hit is not None:
+        if time.monotonic() - hit[1] < _JSON_TTL:
+            _JSON_CACHE.move_to_end(key)
+            return hit[0]
+        del _JSON_CACHE[key]
+    fut = _INFLIGHT.get(key)
+    if fut is not None:
+        return await fut
+    fut = asyncio.get_running_loop().create_future()
+    _INFLIGHT[key] = fut
+    try:
+        async with session.get(url, params=params, timeout=aiohttp.ClientTimeout(total=timeout_s)) as r:
+            if r.status != 200:
+                raise RuntimeError("Weather API unavailable.")
+            data = _loads(await r.read())
+    except Exception as e:
+        # A cancelled follower cancels the shared future out from under
+        # us, so the leader resolves it only if it's still open — the
+        # leader's own raise/return below doesn't depend on the future.
+        if not fut.done():
+            fut.set_exception(e)
+            fut.exception()  # mark retrieved in case nobody else is waiting
+        raise
+    else:
+        if not fut.done():
+            fut.set_result(data)
+        _JSON_CACHE[key] = (data, time.monotonic())
+        if len(_JSON_CACHE) > 2000:
+            _JSON_CACHE.popitem(last=False)
+        return data
+    finally:
+        # If the leader was cancelled (cog unload mid-await), the except
+        # above never ran — cancel the shared future too so followers
+        # blocked on it don't wait forever.
+        if not fut.done():
+            fut.cancel()
+        _INFLIGHT.pop(key, None)
+
+# ZIP -> (city, state, lat, lon). Effectively immutable, but entries carry
+# a 24h TTL so a bad/corrected upstream record doesn't stick forever.
+_ZIP_TTL = 86400.0
+_ZIP_CACHE: Dict[str, Tuple[Tuple[str, str, float, float], float]] = {}
 
 async def _zip_to_place_and_coords(session: aiohttp.ClientSession, zip_code: str):
+    cached = _ZIP_CACHE.get(zip_code)
+    if cached is not None and time.monotonic() - cached[1] < _ZIP_TTL:
+        return cached[0]
     async with session.get(f"https://api.zippopotam.us/us/{zip_code}", timeout=aiohttp.ClientTimeout(total=12)) as r:
         if r.status != 200:
             raise RuntimeError("Invalid ZIP or lookup failed.")
-        zp = await r.json()
+        zp = _loads(await r.read())
     place = zp["places"][0]
     city = place["place name"]; state = place["state abbreviation"]
     lat = float(place["latitude"]); lon = float(place["longitude"])
-    return city, state, lat, lon
+    result = (city, state, lat, lon)
+    _ZIP_CACHE[zip_code] = (result, time.monotonic())
+    return result
 
 async def _fetch_outlook(session: aiohttp.ClientSession, lat: float, lon: float, days: int, tz_name: str, units: str):
-    units = (units or "standard").lower()
-    temp_unit = "fahrenheit" if units == "standard" else "celsius"
-    wind_unit = "mph" if units == "standard" else "kmh"
-    precip_unit = "inch" if units == "standard" else "mm"
+    u = _units_for(units)
+    wind_unit, precip_unit = u.wind, u.precip
     params = {
         "latitude": lat, "longitude": lon,
         "timezone": tz_name,
-        "temperature_unit": temp_unit,
-        "wind_speed_unit": wind_unit,
-        "precipitation_unit": precip_unit,
+        "temperature_unit": u.temp,
+        "wind_speed_unit": u.wind,
+        "precipitation_unit": u.precip,
         "daily": "weather_code,temperature_2m_max,temperature_2m_min,precipitation_sum,precipitation_probability_max,wind_speed_10m_max,sunrise,sunset,uv_index_max",
+        # only transfer/parse the days we'll show (default would be 7)
+        "forecast_days": max(1, min(int(days), 16)),
     }
-    async with session.get("https://api.open-meteo.com/v1/forecast", params=params, timeout=aiohttp.ClientTimeout(total=15)) as r:
-        if r.status != 200:
-            raise RuntimeError("Weather API unavailable.")
-        data = await r.json()
+    data = await _get_json(session, "https://api.open-meteo.com/v1/forecast", params)
     daily = data.get("daily") or {}
     out = []
     dates = (daily.get("time") or [])[:days]
-    tmax = (daily.get("temperature_2m_max") or [])[:days]
-    tmin = (daily.get("temperature_2m_min") or [])[:days]
-    prec = (daily.get("precipitation_sum") or [])[:days]
-    pop  = (daily.get("precipitation_probability_max") or [])[:days]
-    wmax = (daily.get("wind_speed_10m_max") or [])[:days]
-    codes = (daily.get("weather_code") or [])[:days]
-    rises = (daily.get("sunrise") or [])[:days]
-    sets  = (daily.get("sunset") or [])[:days]
-    uvs   = (daily.get("uv_index_max") or [])[:days]
-
-    for i, d in enumerate(dates):
-        hi = tmax[i] if i < len(tmax) else None
-        lo = tmin[i] if i < len(tmin) else None
-        pr = prec[i] if i < len(prec) else 0.0
-        pp = pop[i] if i < len(pop) else None
-        wm = wmax[i] if i < len(wmax) else None
-        code = codes[i] if i < len(codes) else 0
-        sunrise = rises[i] if i < len(rises) else None
-        sunset = sets[i] if i < len(sets) else None
-        uv = uvs[i] if i < len(uvs) else None
+    n = len(dates)
+
+    def col(key, fill=None):
+        # Truncate/pad once so the loop below is a plain zip with no
+        # per-iteration bounds checks.
+        a = (daily.get(key) or [])[:n]
+        return a if len(a) == n else a + [fill] * (n - len(a))
+
+    rows = zip(
+        dates,
+        col("temperature_2m_max"),
+        col("temperature_2m_min"),
+        col("precipitation_sum", 0.0),
+        col("precipitation_probability_max"),
+        col("wind_speed_10m_max"),
+        col("weather_code", 0),
+        col("sunrise"),
+        col("sunset"),
+        col("uv_index_max"),
+    )
+    for d, hi, lo, pr, pp, wm, code, sunrise, sunset, uv in rows:
         icon, desc = wx_icon_desc(code)
         parts = []
         if hi is not None and lo is not None:
@@ -239,24 +406,21 @@ async def _fetch_hourly(session: aiohttp.ClientSession, lat: float, lon: float,
     Each item: (time_str, weather_code, temp, precip_prob, precip_amt, wind)
     time_str is in the requested timezone.
     """
-    units = (units or "standard").lower()
-    temp_unit = "fahrenheit" if units == "standard" else "celsius"
-    wind_unit = "mph" if units == "standard" else "kmh"
-    precip_unit = "inch" if units == "standard" else "mm"
+    u = _units_for(units)
 
     params = {
         "latitude": lat,
         "longitude": lon,
         "timezone": tz_name,
-        "temperature_unit": temp_unit,
-        "wind_speed_unit": wind_unit,
-        "precipitation_unit": precip_unit,
+        "temperature_unit": u.temp,
+        "wind_speed_unit": u.wind,
+        "precipitation_unit": u.precip,
         "hourly": "temperature_2m,weather_code,precipitation_probability,precipitation,wind_speed_10m",
+        # from the current hour, one spare row since the bisect below
+        # starts at the next hour boundary (default is 7 days = 168 rows)
+        "forecast_hours": max(1, min(int(hours) + 1, 48)),
     }
-    async with session.get("https://api.open-meteo.com/v1/forecast", params=params, timeout=aiohttp.ClientTimeout(total=15)) as r:
-        if r.status != 200:
-            raise RuntimeError("Weather API unavailable.")
-        data = await r.json()
+    data = await _get_json(session, "https://api.open-meteo.com/v1/forecast", params)
 
     hourly = data.get("hourly") or {}
     times = hourly.get("time") or []
@@ -267,19 +431,15 @@ async def _fetch_hourly(session: aiohttp.ClientSession, lat: float, lon: float,
     winds = hourly.get("wind_speed_10m") or []
 
     # Find the index closest to "now" in the requested timezone.
+    # Open-Meteo returns sorted local "YYYY-MM-DDTHH:MM" strings, which
+    # compare lexicographically — one bisect against a formatted now-key
+    # replaces a datetime.fromisoformat per row.
     tz = _tzinfo_from_name(tz_name)
-    now_local = datetime.now(tz)
-
-    start_idx = 0
-    for i, ts in enumerate(times):
-        try:
-            # Open-Meteo returns local time strings when timezone is set.
-            t_local = datetime.fromisoformat(ts)
-            if t_local >= now_local.replace(tzinfo=None):
-                start_idx = i
-                break
-        except Exception:
-            continue
+    n = datetime.now(tz)
+    now_key = f"{n.year}-{n.month:02d}-{n.day:02d}T{n.hour:02d}:{n.minute:02d}"
+    start_idx = bisect_left(times, now_key)
+    if start_idx >= len(times):
+        start_idx = 0  # stale/odd payload: fall back to the first rows
 
     end_idx = min(len(times), start_idx + max(1, int(hours)))
     out = []
@@ -291,18 +451,17 @@ async def _fetch_hourly(session: aiohttp.ClientSession, lat: float, lon: float,
             pops[i] if i < len(pops) else None,
             precs[i] if i < len(precs) else None,
             winds[i] if i < len(winds) else None,
-            wind_unit,
-            precip_unit,
-            "°F" if units == "standard" else "°C",
+            u.wind,
+            u.precip,
+            u.deg,
         ))
     return out
 
 # ---- NWS alerts helpers ----
-SEVERITY_ORDER = {"advisory": 0, "watch": 1, "warning": 2}
-NWS_SEV_MAP = {"minor": 0, "moderate": 1, "severe": 2, "extreme": 2}
-
-def _seen_key(uid: int, alert_id: str) -> str:
-    return f"wx_seen:{int(uid)}:{alert_id}"
+# Interned keys make the per-alert dict lookups in the alerts scheduler
+# pointer-comparison fast (NWS reuses these exact strings).
+SEVERITY_ORDER = {sys.intern(k): v for k, v in {"advisory": 0, "watch": 1, "warning": 2}.items()}
+NWS_SEV_MAP = {sys.intern(k): v for k, v in {"minor": 0, "moderate": 1, "severe": 2, "extreme": 2}.items()}
 
 CADENCE_CHOICES = [
     app_commands.Choice(name="daily", value="daily"),
@@ -321,27 +480,99 @@ class Weather(commands.Cog):
                 self.store = getattr(_bot_main, "store", None)
             except Exception:
                 self.store = None
-        # Feedback anti-spam (user_id -> last_ts)
-        self._feedback_last = {}
+        # Feedback anti-spam (user_id -> last_ts), LRU-capped so a
+        # long-running process doesn't accumulate one entry per user forever
+        self._feedback_last: OrderedDict[int, float] = OrderedDict()
+
+        # Shared HTTP session (created lazily on the loop, reused everywhere)
+        self._http: Optional[aiohttp.ClientSession] = None
+
+        # Users fetched over HTTP (gateway cache misses), kept for an hour
+        # so the schedulers don't re-fetch the same subscriber every tick
+        self._user_cache: Dict[int, Tuple[discord.User, float]] = {}
+
+        # NWS alerts per coarse lat/lon bucket, with a short TTL so one
+        # scheduler tick never fetches the same region's feed twice
+        self._alerts_cache: Dict[Tuple[float, float], Tuple[list, float]] = {}
+
+        # Scheduler outlooks, cached 30 min (Open-Meteo updates hourly);
+        # interactive /weather always fetches fresh
+        self._outlook_cache: Dict[Tuple, Tuple[list, float]] = {}
+
+        # Last ETag + parsed alerts per point, so the 5-min alert poll can
+        # send If-None-Match and skip download+parse on 304 Not Modified
+        self._nws_etag: Dict[Tuple[float, float], Tuple[str, list]] = {}
+
+        # Seen-marker pruning runs at most daily (see wx_alerts_scheduler)
+        self._last_prune = 0.0
+
+        # (date, (name, emoji, age)) — astral does real astronomical math,
+        # so compute it off-loop at most once per local day
+        self._moon_cache: Tuple[Optional[Any], Optional[Tuple[str, str, float]]] = (None, None)
 
         # Background loops
         self.weather_scheduler.start()
         self.wx_alerts_scheduler.start()
 
+    async def _session(self) -> aiohttp.ClientSession:
+        """Lazily create the shared ClientSession.
+
+        One session means pooled keep-alive connections to zippopotam /
+        open-meteo / weather.gov instead of a TCP+TLS handshake per command.
+        """
+        if self._http is None or self._http.closed:
+            self._http = aiohttp.ClientSession(
+                headers=HTTP_HEADERS,
+                connector=aiohttp.TCPConnector(limit=50, ttl_dns_cache=300, keepalive_timeout=60),
+            )
+        return self._http
+
+    async def _get_user(self, uid: int) -> discord.User:
+        """Resolve a user without an HTTP call when possible.
+
+        Checks the gateway cache first, then our own TTL cache of users
+        fetched earlier; only falls back to the rate-limited fetch_user.
+        """
+        user = self.bot.get_user(uid)
+        if user is not None:
+            return user
+        entry = self._user_cache.get(uid)
+        if entry is not None and time.monotonic() - entry[1] < 3600:
+            return entry[0]
+        user = await self.bot.fetch_user(uid)
+        self._user_cache[uid] = (user, time.monotonic())
+        return user
+
+    async def _moon_info(self, now_local: datetime) -> Tuple[str, str, float]:
+        """Moon phase for now_local's date, computed at most once per day."""
+        key = now_local.date()
+        cached_day, info = self._moon_cache
+        if cached_day == key and info is not None:
+            return info
+        info = await asyncio.to_thread(moon_phase_info_for_date, now_local)
+        self._moon_cache = (key, info)
+        return info
+
     def cog_unload(self):
         self.weather_scheduler.cancel()
         self.wx_alerts_scheduler.cancel()
+        if self._http is not None and not self._http.closed:
+            asyncio.create_task(self._http.close())
 
     # -------- Slash Commands --------
 
 
     async def _send_feedback(self, inter: discord.Interaction, kind: str, message: str) -> None:
-        # simple cooldown: 1 per 60s per user
-        now = asyncio.get_event_loop().time()
+        # simple cooldown: 1 per 60s per user (discord already timestamps
+        # the interaction; no event-loop clock lookup needed)
+        now = inter.created_at.timestamp()
         last = self._feedback_last.get(inter.user.id, 0.0)
         if now - last < 60:
             raise RuntimeError("cooldown")
         self._feedback_last[inter.user.id] = now
+        self._feedback_last.move_to_end(inter.user.id)
+        if len(self._feedback_last) > 10_000:
+            self._feedback_last.popitem(last=False)
 
         message = (message or "").strip()
         if not message:
@@ -380,62 +611,60 @@ class Weather(commands.Cog):
             owner = await self.bot.fetch_user(BOT_OWNER_ID)
         await owner.send(embed=embed)
 
-    @app_commands.command(name="feedback", description="Send feedback to the bot owner.")
-    @app_commands.describe(message="What should I improve? Bug report or feature request.")
-    async def feedback_cmd(self, inter: discord.Interaction, message: str):
+    # Per-kind user-facing strings; everything else about the three
+    # feedback commands is identical and lives in _run_feedback.
+    _FEEDBACK_MSGS = {
+        "Feedback": {
+            "cooldown": "You're sending feedback a bit fast—try again in a minute.",
+            "no_owner": "Feedback isn't configured (missing BOT_OWNER_ID).",
+            "deliver": "Couldn't deliver your feedback (DMs may be blocked).",
+            "ok": "✅ Thanks! Your feedback was sent.",
+        },
+        "Bug Report": {
+            "cooldown": "You're sending reports a bit fast—try again in a minute.",
+            "no_owner": "Bug reporting isn't configured (missing BOT_OWNER_ID).",
+            "deliver": "Couldn't deliver your report (DMs may be blocked).",
+            "ok": "✅ Thanks! Your bug report was sent.",
+        },
+        "Feature Request": {
+            "cooldown": "You're sending requests a bit fast—try again in a minute.",
+            "no_owner": "Feature requests aren't configured (missing BOT_OWNER_ID).",
+            "deliver": "Couldn't deliver your request (DMs may be blocked).",
+            "ok": "✅ Thanks! Your feature request was sent.",
+        },
+    }
+
+    async def _run_feedback(self, inter: discord.Interaction, kind: str, message: str):
+        msgs = self._FEEDBACK_MSGS[kind]
         await inter.response.defer(ephemeral=True, thinking=False)
         try:
-            await self._send_feedback(inter, "Feedback", message)
+            await self._send_feedback(inter, kind, message)
         except RuntimeError as e:
-            if str(e) == "cooldown":
-                return await inter.followup.send("You're sending feedback a bit fast—try again in a minute.", ephemeral=True)
-            if str(e) == "no_owner":
-                return await inter.followup.send("Feedback isn't configured (missing BOT_OWNER_ID).", ephemeral=True)
-            if str(e) == "bad_channel":
+            code = str(e)
+            if code in ("cooldown", "no_owner"):
+                return await inter.followup.send(msgs[code], ephemeral=True)
+            if code == "bad_channel":
                 return await inter.followup.send("Feedback channel is misconfigured (FEEDBACK_CHANNEL_ID).", ephemeral=True)
-            return await inter.followup.send("Couldn't deliver your feedback (DMs may be blocked).", ephemeral=True)
+            return await inter.followup.send(msgs["deliver"], ephemeral=True)
         except ValueError:
             return await inter.followup.send("Please include a message.", ephemeral=True)
 
-        await inter.followup.send("✅ Thanks! Your feedback was sent.", ephemeral=True)
+        await inter.followup.send(msgs["ok"], ephemeral=True)
+
+    @app_commands.command(name="feedback", description="Send feedback to the bot owner.")
+    @app_commands.describe(message="What should I improve? Bug report or feature request.")
+    async def feedback_cmd(self, inter: discord.Interaction, message: str):
+        await self._run_feedback(inter, "Feedback", message)
 
     @app_commands.command(name="bug", description="Report a bug to the bot owner.")
     @app_commands.describe(message="What happened? Include steps if possible.")
     async def bug_cmd(self, inter: discord.Interaction, message: str):
-        await inter.response.defer(ephemeral=True, thinking=False)
-        try:
-            await self._send_feedback(inter, "Bug Report", message)
-        except RuntimeError as e:
-            if str(e) == "cooldown":
-                return await inter.followup.send("You're sending reports a bit fast—try again in a minute.", ephemeral=True)
-            if str(e) == "no_owner":
-                return await inter.followup.send("Bug reporting isn't configured (missing BOT_OWNER_ID).", ephemeral=True)
-            if str(e) == "bad_channel":
-                return await inter.followup.send("Feedback channel is misconfigured (FEEDBACK_CHANNEL_ID).", ephemeral=True)
-            return await inter.followup.send("Couldn't deliver your report (DMs may be blocked).", ephemeral=True)
-        except ValueError:
-            return await inter.followup.send("Please include a message.", ephemeral=True)
-
-        await inter.followup.send("✅ Thanks! Your bug report was sent.", ephemeral=True)
+        await self._run_feedback(inter, "Bug Report", message)
 
     @app_commands.command(name="feature", description="Request a feature to the bot owner.")
     @app_commands.describe(message="What would you like added/changed?")
     async def feature_cmd(self, inter: discord.Interaction, message: str):
-        await inter.response.defer(ephemeral=True, thinking=False)
-        try:
-            await self._send_feedback(inter, "Feature Request", message)
-        except RuntimeError as e:
-            if str(e) == "cooldown":
-                return await inter.followup.send("You're sending requests a bit fast—try again in a minute.", ephemeral=True)
-            if str(e) == "no_owner":
-                return await inter.followup.send("Feature requests aren't configured (missing BOT_OWNER_ID).", ephemeral=True)
-            if str(e) == "bad_channel":
-                return await inter.followup.send("Feedback channel is misconfigured (FEEDBACK_CHANNEL_ID).", ephemeral=True)
-            return await inter.followup.send("Couldn't deliver your request (DMs may be blocked).", ephemeral=True)
-        except ValueError:
-            return await inter.followup.send("Please include a message.", ephemeral=True)
-
-        await inter.followup.send("✅ Thanks! Your feature request was sent.", ephemeral=True)
+        await self._run_feedback(inter, "Feature Request", message)
 
     
     @app_commands.command(name="moon", description="Show today's moon phase (uses your saved ZIP if you omit it).")
@@ -448,7 +677,7 @@ class Weather(commands.Cog):
         # Resolve ZIP (optional, just to show city/state like /weather does)
         z = None
         if zip and str(zip).strip():
-            z = re.sub(r"[^0-9]", "", str(zip))
+            z = _clean_zip(zip)
             if len(z) != 5:
                 return await inter.response.send_message("Please give a valid 5‑digit US ZIP.", ephemeral=True)
         else:
@@ -459,21 +688,15 @@ class Weather(commands.Cog):
         title_loc = ""
         if z:
             try:
-                async with aiohttp.ClientSession(headers=HTTP_HEADERS) as session:
-                    async with session.get(f"https://api.zippopotam.us/us/{z}", timeout=aiohttp.ClientTimeout(total=12)) as r:
-                        if r.status == 200:
-                            zp = await r.json()
-                            place = zp["places"][0]
-                            city = place["place name"]; state = place["state abbreviation"]
-                            title_loc = f" — {city}, {state} {z}"
+                session = await self._session()
+                city, state, _lat, _lon = await _zip_to_place_and_coords(session, z)
+                title_loc = f" — {city}, {state} {z}"
             except Exception:
                 # If ZIP lookup fails, still show phase
                 pass
 
-        tz_name = _get_user_tz_name(self.store, inter.user.id)
-        tz = _tzinfo_from_name(tz_name)
-        now_local = datetime.now(tz)
-        name, emoji, age = moon_phase_info_for_date(now_local)
+        now_local, _tz, tz_name = _now_local(self.store, inter.user.id)
+        name, emoji, age = await self._moon_info(now_local)
 
         emb = discord.Embed(
             title=f"{emoji} Moon Phase{title_loc}",
@@ -501,16 +724,14 @@ class Weather(commands.Cog):
                 )
             z = str(saved)
         else:
-            z = re.sub(r"[^0-9]", "", str(zip))
+            z = _clean_zip(zip)
             if len(z) != 5:
                 return await inter.followup.send("Please give a valid 5‑digit US ZIP.", ephemeral=True)
 
         units = _get_user_units(self.store, inter.user.id)
-        tz_name = _get_user_tz_name(self.store, inter.user.id)
-        temp_unit = "fahrenheit" if units == "standard" else "celsius"
-        wind_unit = "mph" if units == "standard" else "kmh"
-        precip_unit = "inch" if units == "standard" else "mm"
-        deg = "°F" if units == "standard" else "°C"
+        now_local, _tz, tz_name = _now_local(self.store, inter.user.id)
+        u = _units_for(units)
+        wind_unit, precip_unit, deg = u.wind, u.precip, u.deg
 
         def _to_f(val):
             if val is None:
@@ -522,23 +743,27 @@ class Weather(commands.Cog):
                 return None
 
         try:
-            async with aiohttp.ClientSession(headers=HTTP_HEADERS) as session:
-                city, state, lat, lon = await _zip_to_place_and_coords(session, z)
-
-                params = {
-                    "latitude": lat,
-                    "longitude": lon,
-                    "temperature_unit": temp_unit,
-                    "wind_speed_unit": wind_unit,
-                    "precipitation_unit": precip_unit,
-                    "timezone": tz_name,
-                    "current": "temperature_2m,apparent_temperature,relative_humidity_2m,wind_speed_10m,wind_gusts_10m,precipitation,weather_code",
-                    "daily": "weather_code,temperature_2m_max,temperature_2m_min,precipitation_sum,precipitation_probability_max,uv_index_max,sunrise,sunset,wind_speed_10m_max",
-                }
-                async with session.get("https://api.open-meteo.com/v1/forecast", params=params, timeout=aiohttp.ClientTimeout(total=15)) as r2:
-                    if r2.status != 200:
-                        return await inter.followup.send("Weather service is unavailable right now.", ephemeral=True)
-                    wx = await r2.json()
+            session = await self._session()
+            city, state, lat, lon = await _zip_to_place_and_coords(session, z)
+
+            params = {
+                "latitude": lat,
+                "longitude": lon,
+                "temperature_unit": u.temp,
+                "wind_speed_unit": wind_unit,
+                "precipitation_unit": precip_unit,
+                "timezone": tz_name,
+                "current": "temperature_2m,apparent_temperature,relative_humidity_2m,wind_speed_10m,wind_gusts_10m,precipitation,weather_code",
+                "daily": "weather_code,temperature_2m_max,temperature_2m_min,precipitation_sum,precipitation_probability_max,uv_index_max,sunrise,sunset,wind_speed_10m_max",
+            }
+            # The moon-phase math (CPU, off-thread) overlaps the forecast
+            # round-trip instead of running after it.
+            moon_task = asyncio.ensure_future(self._moon_info(now_local))
+
+            try:
+                wx = await _get_json(session, "https://api.open-meteo.com/v1/forecast", params)
+            except RuntimeError:
+                return await inter.followup.send("Weather service is unavailable right now.", ephemeral=True)
 
             cur = wx.get("current") or wx.get("current_weather") or {}
             t = cur.get("temperature_2m") or cur.get("temperature")
@@ -550,54 +775,57 @@ class Weather(commands.Cog):
             code_now = cur.get("weather_code")
             daily = wx.get("daily") or {}
 
-            icon, desc = wx_icon_desc((daily.get("weather_code") or [code_now or 0])[0])
-            hi = (daily.get("temperature_2m_max") or [None])[0]
-            lo = (daily.get("temperature_2m_min") or [None])[0]
-            prcp_prob = (daily.get("precipitation_probability_max") or [None])[0]
-            uv = (daily.get("uv_index_max") or [None])[0]
-            sunrise = (daily.get("sunrise") or [None])[0]
-            sunset = (daily.get("sunset") or [None])[0]
-            wind_max = (daily.get("wind_speed_10m_max") or [None])[0]
+            code_today = _first(daily, "weather_code")
+            icon, desc = wx_icon_desc(code_today if code_today is not None else (code_now or 0))
+            hi = _first(daily, "temperature_2m_max")
+            lo = _first(daily, "temperature_2m_min")
+            prcp_prob = _first(daily, "precipitation_probability_max")
+            uv = _first(daily, "uv_index_max")
+            sunrise = _first(daily, "sunrise")
+            sunset = _first(daily, "sunset")
+            wind_max = _first(daily, "wind_speed_10m_max")
 
             color_temp_f = _to_f(t)
             if color_temp_f is None:
                 color_temp_f = _to_f(hi)
-            emb = discord.Embed(
-                title=f"{icon} Weather — {city}, {state} {z}",
-                description=f"**{desc}**",
-                colour=wx_color_from_temp_f(color_temp_f if color_temp_f is not None else 70),
-            )
 
+            # Collect fields in a plain list and build the embed with one
+            # from_dict call instead of ~11 add_field round-trips.
+            fields = []
             if t is not None:
-                emb.add_field(name="Now", value=f"**{round(float(t))}{deg}** (feels {round(float(feels))}{deg})", inline=True)
+                fields.append({"name": "Now", "value": f"**{round(float(t))}{deg}** (feels {round(float(feels))}{deg})", "inline": True})
             if hi is not None and lo is not None:
-                emb.add_field(name="Today", value=f"High **{round(float(hi))}{deg}** / Low **{round(float(lo))}{deg}**", inline=True)
+                fields.append({"name": "Today", "value": f"High **{round(float(hi))}{deg}** / Low **{round(float(lo))}{deg}**", "inline": True})
             if rh is not None:
-                emb.add_field(name="Humidity", value=f"{int(rh)}%", inline=True)
+                fields.append({"name": "Humidity", "value": f"{int(rh)}%", "inline": True})
             if wind is not None:
                 wind_txt = f"{round(float(wind))} {wind_unit}"
                 if gust is not None:
                     wind_txt += f" (gusts {round(float(gust))} {wind_unit})"
-                emb.add_field(name="Wind", value=wind_txt, inline=True)
-            emb.add_field(name="Precip (now)", value=f"{float(pcp):.2f} {precip_unit}", inline=True)
+                fields.append({"name": "Wind", "value": wind_txt, "inline": True})
+            fields.append({"name": "Precip (now)", "value": f"{float(pcp):.2f} {precip_unit}", "inline": True})
             if prcp_prob is not None:
-                emb.add_field(name="Precip Chance", value=f"{int(prcp_prob)}%", inline=True)
+                fields.append({"name": "Precip Chance", "value": f"{int(prcp_prob)}%", "inline": True})
             if wind_max is not None:
-                emb.add_field(name="Max Wind Today", value=f"{round(float(wind_max))} {wind_unit}", inline=True)
+                fields.append({"name": "Max Wind Today", "value": f"{round(float(wind_max))} {wind_unit}", "inline": True})
             if uv is not None:
-                emb.add_field(name="UV Index (max)", value=str(round(float(uv), 1)), inline=True)
+                fields.append({"name": "UV Index (max)", "value": str(round(float(uv), 1)), "inline": True})
             if sunrise:
-                emb.add_field(name="Sunrise", value=fmt_sun(sunrise), inline=True)
+                fields.append({"name": "Sunrise", "value": fmt_sun(sunrise), "inline": True})
             if sunset:
-                emb.add_field(name="Sunset", value=fmt_sun(sunset), inline=True)
-
-            # Moon phase (in user's timezone)
-            tz = _tzinfo_from_name(tz_name)
-            now_local = datetime.now(tz)
-            m_name, m_emoji, m_age = moon_phase_info_for_date(now_local)
-            emb.add_field(name="Moon", value=f"{m_emoji} {m_name} ({m_age}d)", inline=True)
-
-            emb.set_footer(text=f"Units: {units} • Timezone: {tz_name}")
+                fields.append({"name": "Sunset", "value": fmt_sun(sunset), "inline": True})
+
+            # Moon phase (in user's timezone), started before the fetch
+            m_name, m_emoji, m_age = await moon_task
+            fields.append({"name": "Moon", "value": f"{m_emoji} {m_name} ({m_age}d)", "inline": True})
+
+            emb = discord.Embed.from_dict({
+                "title": f"{icon} Weather — {city}, {state} {z}",
+                "description": f"**{desc}**",
+                "color": wx_color_from_temp_f(color_temp_f if color_temp_f is not None else 70).value,
+                "fields": fields,
+                "footer": {"text": f"Units: {units} • Timezone: {tz_name}"},
+            })
             await inter.followup.send(embed=emb)
         except Exception as e:
             await inter.followup.send(f"\u26A0\ufe0f Weather error: {e}", ephemeral=True)
@@ -616,7 +844,7 @@ class Weather(commands.Cog):
         val = (mode.value or "standard").lower()
         if val not in {"standard", "metric"}:
             val = "standard"
-        self.store.set_note(inter.user.id, "wx_units", val)
+        await asyncio.to_thread(self.store.set_note, inter.user.id, "wx_units", val)
         await inter.response.send_message(f"✅ Units saved: **{val}**", ephemeral=True)
 
     @app_commands.command(name="timezone", description="Set your timezone for hourly forecasts and scheduling.")
@@ -638,7 +866,7 @@ class Weather(commands.Cog):
                     ephemeral=True,
                 )
 
-        self.store.set_note(inter.user.id, "wx_tz", tz_name)
+        await asyncio.to_thread(self.store.set_note, inter.user.id, "wx_tz", tz_name)
         await inter.response.send_message(f"✅ Timezone saved: **{tz_name}**", ephemeral=True)
 
     @app_commands.command(name="settings", description="Show your saved weather settings.")
@@ -674,7 +902,7 @@ class Weather(commands.Cog):
                 )
             z = str(saved)
         else:
-            z = re.sub(r"[^0-9]", "", str(zip))
+            z = _clean_zip(zip)
             if len(z) != 5:
                 return await inter.followup.send("Please give a valid 5‑digit US ZIP.", ephemeral=True)
 
@@ -682,13 +910,12 @@ class Weather(commands.Cog):
         tz_name = _get_user_tz_name(self.store, inter.user.id)
 
         try:
-            async with aiohttp.ClientSession(headers=HTTP_HEADERS) as session:
-                city, state, lat, lon = await _zip_to_place_and_coords(session, z)
-                rows = await _fetch_hourly(session, lat, lon, tz_name=tz_name, units=units, hours=int(hours or 12))
+            session = await self._session()
+            city, state, lat, lon = await _zip_to_place_and_coords(session, z)
+            rows = await _fetch_hourly(session, lat, lon, tz_name=tz_name, units=units, hours=int(hours or 12))
 
-            deg = rows[0][8] if rows else ("°F" if units == "standard" else "°C")
-            wind_unit = rows[0][6] if rows else ("mph" if units == "standard" else "kmh")
-            precip_unit = rows[0][7] if rows else ("inch" if units == "standard" else "mm")
+            u = _units_for(units)
+            deg, wind_unit, precip_unit = u.deg, u.wind, u.precip
 
             emb = discord.Embed(
                 title=f"🕒 Hourly Forecast — {city}, {state} {z}",
@@ -698,60 +925,57 @@ class Weather(commands.Cog):
 
             lines = []
             for ts, code, temp, pop, prec, wind, wunit, punit, degsym in rows:
-                try:
-                    t_local = datetime.fromisoformat(ts)
-                    label = t_local.strftime("%-I %p")
-                except Exception:
-                    label = ts[11:16]
+                # "HH" straight out of the ISO string: no fromisoformat, no
+                # locale strftime, and no non-portable %-I fallback path
+                hh = int(ts[11:13])
+                label = f"{(hh - 1) % 12 + 1} {'AM' if hh < 12 else 'PM'}"
                 icon, desc = wx_icon_desc(code)
-                parts = []
-                if temp is not None:
-                    parts.append(f"{round(float(temp))}{degsym}")
-                if pop is not None:
-                    parts.append(f"☔ {int(pop)}%")
-                if wind is not None:
-                    parts.append(f"💨 {round(float(wind))} {wunit}")
-                if prec is not None:
-                    parts.append(f"📏 {float(prec):.2f} {punit}")
-                lines.append(f"**{label}** — {icon} {desc} — " + " • ".join(parts))
-
-            # Split output across multiple fields to avoid Discord's 1024-char field limit
+                # one join over a literal tuple, one f-string per line —
+                # no append-per-bit list building or trailing concat
+                bits = " • ".join(b for b in (
+                    f"{round(float(temp))}{degsym}" if temp is not None else None,
+                    f"☔ {int(pop)}%" if pop is not None else None,
+                    f"💨 {round(float(wind))} {wunit}" if wind is not None else None,
+                    f"📏 {float(prec):.2f} {punit}" if prec is not None else None,
+                ) if b)
+                lines.append(f"**{label}** — {icon} {desc} — {bits}")
+
+            # Split output across multiple fields to avoid Discord's 1024-char field limit.
+            # Prefix sums over the line lengths turn each split point into one
+            # bisect instead of a running-total branch per line.
             def _add_chunked_fields(embed: discord.Embed, title: str, lines_in: list[str], max_len: int = 1024):
-                chunk: list[str] = []
-                chunk_len = 0
-                part = 1
-
-                for line in lines_in:
-                    # +1 accounts for the newline that will be inserted when joining
-                    add_len = len(line) + (1 if chunk else 0)
-
-                    # If a single line is too long (shouldn't happen, but be safe), trim it
-                    if len(line) > max_len:
-                        line = line[: max_len - 1] + "…"
-                        add_len = len(line) + (1 if chunk else 0)
-
-                    if chunk_len + add_len > max_len:
-                        embed.add_field(
-                            name=f"{title} (Part {part})",
-                            value="\n".join(chunk) if chunk else "No data.",
-                            inline=False,
-                        )
-                        part += 1
-                        chunk = [line]
-                        chunk_len = len(line)
-                    else:
-                        chunk.append(line)
-                        chunk_len += add_len
-
-                if chunk:
+                # An overlong line can't span a split; trim up front (shouldn't happen)
+                lines_in = [l if len(l) <= max_len else l[: max_len - 1] + "…" for l in lines_in]
+                # cum[i] = len("\n".join(lines_in[:i])) + 1 trailing newline
+                cum = [0]
+                cum.extend(accumulate(len(l) + 1 for l in lines_in))
+
+                chunks: list[str] = []
+                start, n = 0, len(lines_in)
+                while start < n:
+                    # largest j with cum[j] - cum[start] - 1 <= max_len; the +1
+                    # lower bound guarantees progress (single lines always fit)
+                    j = bisect_right(cum, cum[start] + max_len + 1, lo=start + 1) - 1
+                    chunks.append("\n".join(lines_in[start:j]))
+                    start = j
+
+                for part, value in enumerate(chunks, 1):
                     embed.add_field(
-                        name=f"{title} (Part {part})" if part > 1 else title,
-                        value="\n".join(chunk) if chunk else "No data.",
+                        name=f"{title} (Part {part})" if len(chunks) > 1 else title,
+                        value=value,
                         inline=False,
                     )
 
             want_hours = int(hours or 12)
-            _add_chunked_fields(emb, "Forecast", lines[:want_hours])
+            shown = lines[:want_hours]
+            joined = "\n".join(shown)
+            # The description limit (4096) dwarfs the per-field one (1024);
+            # appending there keeps the payload to zero fields in the common
+            # case, falling back to chunked fields only when it can't fit.
+            if len(emb.description) + 2 + len(joined) <= 4096:
+                emb.description = f"{emb.description}\n\n{joined}"
+            else:
+                _add_chunked_fields(emb, "Forecast", shown)
             await inter.followup.send(embed=emb)
         except Exception as e:
             await inter.followup.send(f"\u26A0\ufe0f Hourly error: {e}", ephemeral=True)
@@ -760,10 +984,10 @@ class Weather(commands.Cog):
     async def weather_set_zip(self, inter: discord.Interaction, zip: app_commands.Range[str, 5, 10]):
         if self.store is None:
             return await inter.response.send_message("Storage backend not available.", ephemeral=True)
-        z = re.sub(r"[^0-9]", "", zip)
+        z = _clean_zip(zip)
         if len(z) != 5:
             return await inter.response.send_message("Please provide a valid 5‑digit US ZIP.", ephemeral=True)
-        self.store.set_user_zip(inter.user.id, z)
+        await asyncio.to_thread(self.store.set_user_zip, inter.user.id, z)
         await inter.response.send_message(f"\u2705 Saved default ZIP: **{z}**", ephemeral=True)
 
     @app_commands.command(name="weather_subscribe", description="Subscribe to a daily or weekly weather DM at a local-time hour.")
@@ -787,7 +1011,7 @@ class Weather(commands.Cog):
         await inter.response.defer(ephemeral=True)
         try:
             hh, mi = _parse_time(time)
-            z = re.sub(r"[^0-9]", "", zip) if zip else (self.store.get_user_zip(inter.user.id) or "")
+            z = _clean_zip(zip) if zip else (self.store.get_user_zip(inter.user.id) or "")
             if len(z) != 5:
                 return await inter.followup.send("Set a ZIP with `/weather_set_zip` or provide it here.", ephemeral=True)
             tz_name = _get_user_tz_name(self.store, inter.user.id)
@@ -807,7 +1031,7 @@ class Weather(commands.Cog):
                 "units": units,
                 "next_run_utc": next_run_utc.isoformat(),
             }
-            sid = self.store.add_weather_sub(sub)
+            sid = await asyncio.to_thread(self.store.add_weather_sub, sub)
             await inter.followup.send(
                 f"\U0001F324\ufe0f Subscribed **#{sid}** — {cadence.value} at **{first_local.strftime('%I:%M %p')}** ({tz_name}) for ZIP **{z}**.\n"
                 + ("Weekly outlook length: **{} days**.".format(sub['weekly_days']) if cadence.value == "weekly" else "Daily: Today & Tomorrow.")
@@ -822,22 +1046,26 @@ class Weather(commands.Cog):
         if self.store is None:
             return await inter.response.send_message("Storage backend not available.", ephemeral=True)
         await inter.response.defer(ephemeral=True)
-        items = self.store.list_weather_subs(inter.user.id)
+        items = await asyncio.to_thread(self.store.list_weather_subs, inter.user.id)
         if not items:
             return await inter.followup.send("You have no weather subscriptions.", ephemeral=True)
 
         out_lines = []
+        updates = []  # deferred next_run repairs, applied in one transaction
+        now_utc = datetime.now(timezone.utc)  # one clock read for the whole listing
+        local_now: Dict[str, datetime] = {}  # one astimezone() per distinct tz
 
         for s in items:
-            tz_name = (s.get("tz_name") or "").strip() or _get_user_tz_name(self.store, inter.user.id)
-            tz = _tzinfo_from_name(tz_name)
-            now_local = datetime.now(tz)
-            units = (s.get("units") or "").strip() or _get_user_units(self.store, inter.user.id)
-            hh = int(s.get("hh", 8))
-            mi = int(s.get("mi", 0))
-            cadence = s.get("cadence", "daily") if s.get("cadence") in {"daily", "weekly"} else "daily"
-
-            raw = s.get("next_run_utc")
+            tz_name = (s["tz_name"] or "").strip() or _get_user_tz_name(self.store, inter.user.id)
+            now_local = local_now.get(tz_name)
+            if now_local is None:
+                now_local = local_now[tz_name] = now_utc.astimezone(_tzinfo_from_name(tz_name))
+            units = (s["units"] or "").strip() or _get_user_units(self.store, inter.user.id)
+            hh = int(s["hh"])
+            mi = int(s["mi"])
+            cadence = s["cadence"] if s["cadence"] in {"daily", "weekly"} else "daily"
+
+            raw = s["next_run_utc"]
             nxt = None
             needs = False
             if not raw or str(raw).strip().lower() == "none":
@@ -848,18 +1076,21 @@ class Weather(commands.Cog):
                 except Exception:
                     needs = True
 
-            if not needs and nxt is not None and nxt <= datetime.now(timezone.utc):
+            if not needs and nxt is not None and nxt <= now_utc:
                 needs = True
 
             if needs:
                 first_local = _next_local_run(now_local, hh, mi, cadence)
                 nxt = first_local.astimezone(timezone.utc)
-                self.store.update_weather_sub(s["id"], user_id=int(s["user_id"]), next_run_utc=nxt.isoformat())
+                updates.append({"id": s["id"], "next_run_utc": nxt.isoformat()})
 
             out_lines.append(
-                f"**#{s['id']}** — {cadence} at {hh:02d}:{mi:02d} ({tz_name}) - ZIP {s.get('zip','?????')} - units {units} - next: {_fmt_local(nxt, tz_name)}"
+                f"**#{s['id']}** — {cadence} at {hh:02d}:{mi:02d} ({tz_name}) - ZIP {s['zip']} - units {units} - next: {_fmt_local(nxt, tz_name)}"
             )
 
+        if updates:
+            await asyncio.to_thread(self.store.update_weather_subs, updates)
+
         await inter.followup.send("\n".join(out_lines), ephemeral=True)
 
     @app_commands.command(name="weather_unsubscribe", description="Unsubscribe from weather DMs by ID.")
@@ -867,7 +1098,7 @@ class Weather(commands.Cog):
         if self.store is None:
             return await inter.response.send_message("Storage backend not available.", ephemeral=True)
         await inter.response.defer(ephemeral=True)
-        ok = self.store.remove_weather_sub(sub_id, requester_id=inter.user.id)
+        ok = await asyncio.to_thread(self.store.remove_weather_sub, sub_id, requester_id=inter.user.id)
         await inter.followup.send("Removed." if ok else "Couldn't remove that ID.", ephemeral=True)
 
     @app_commands.command(name="wx_alerts", description="Enable/disable severe weather alerts via DM (NWS).")
@@ -886,10 +1117,10 @@ class Weather(commands.Cog):
         if mode not in ("on", "off"):
             return await inter.response.send_message("Use **on** or **off**.", ephemeral=True)
         if mode == "off":
-            self.store.set_note(inter.user.id, "wx_alerts_enabled", "0")
+            await asyncio.to_thread(self.store.set_note, inter.user.id, "wx_alerts_enabled", "0")
             return await inter.response.send_message("\U0001F515 Severe weather alerts disabled.", ephemeral=True)
 
-        z = re.sub(r"[^0-9]", "", zip) if zip else (self.store.get_user_zip(inter.user.id) or "")
+        z = _clean_zip(zip) if zip else (self.store.get_user_zip(inter.user.id) or "")
         if len(z) != 5:
             return await inter.response.send_message("Set a ZIP with `/weather_set_zip` or provide it here.", ephemeral=True)
 
@@ -897,88 +1128,128 @@ class Weather(commands.Cog):
         if sev not in ("advisory", "watch", "warning"):
             sev = "watch"
 
-        self.store.set_note(inter.user.id, "wx_alerts_enabled", "1")
-        self.store.set_note(inter.user.id, "wx_alerts_zip", z)
-        self.store.set_note(inter.user.id, "wx_alerts_min_sev", sev)
+        # One transaction (and one fsync) for all three settings
+        await asyncio.to_thread(self.store.set_notes_bulk, inter.user.id, [
+            ("wx_alerts_enabled", "1"),
+            ("wx_alerts_zip", z),
+            ("wx_alerts_min_sev", sev),
+        ])
         await inter.response.send_message(f"\U0001F514 Alerts **ON** for **{z}** (min severity: **{sev}**).", ephemeral=True)
 
     # -------- Schedulers --------
+    def _build_outlook_embed(self, s, city, state, tz_name, units, outlook, days: int):
+        """Build the daily/weekly outlook DM embed for one subscription."""
+        daily = s["cadence"] == "daily"
+        first_hi = outlook[0][5] if outlook and outlook[0][5] is not None else None
+        first_hi_f = None
+        if first_hi is not None:
+            try:
+                first_hi_f = float(first_hi) if units == "standard" else (float(first_hi) * 9.0 / 5.0 + 32.0)
+            except Exception:
+                first_hi_f = None
+        title = (
+            f"\U0001F324\ufe0f Daily Outlook — {city}, {state} {s['zip']}"
+            if daily else
+            f"\U0001F5D3\ufe0f Weekly Outlook ({days} days) — {city}, {state} {s['zip']}"
+        )
+        emb = discord.Embed(
+            title=title,
+            colour=wx_color_from_temp_f(first_hi_f if first_hi_f is not None else 70)
+        )
+        for (d, line, sunrise, sunset, uv, _hi) in outlook:
+            if daily:
+                extras = []
+                if sunrise: extras.append(f"\U0001F305 {fmt_sun(sunrise)}")
+                if sunset: extras.append(f"\U0001F307 {fmt_sun(sunset)}")
+                if uv is not None: extras.append(f"\U0001F506 UV {round(uv,1)}")
+                value = "\n".join([line, " - ".join(extras)]) if extras else line
+            else:
+                value = line
+            emb.add_field(name=d, value=value, inline=False)
+        emb.set_footer(text=f"Scheduled in {tz_name} • Units: {units}")
+        return emb
+
+    async def _deliver_sub(self, s, city, state, tz_name, units, outlook, days, now_utc, sem):
+        """DM one subscriber and reschedule; on failure retry in 5 minutes."""
+        try:
+            emb = self._build_outlook_embed(s, city, state, tz_name, units, outlook, days)
+            async with sem:
+                user = await self._get_user(int(s["user_id"]))
+                await user.send(embed=emb)
+            tz = _tzinfo_from_name(tz_name)
+            # Same pure helper the listing command uses: next occurrence of
+            # hh:mi, stepping by the cadence period only when today's slot
+            # has already passed. The old inline version stepped weekly subs
+            # +7d unconditionally, drifting a week if a retry fired early.
+            next_local = _next_local_run(datetime.now(tz), s["hh"], s["mi"], s["cadence"])
+            return {"id": s["id"], "next_run_utc": next_local.astimezone(timezone.utc).isoformat()}
+        except Exception:
+            fallback = now_utc + timedelta(minutes=5)
+            return {"id": s["id"], "next_run_utc": fallback.isoformat()}
+
+    async def _cached_outlook(self, session, lat: float, lon: float, days: int, tz_name: str, units: str):
+        """Outlook for the scheduler, cached 30 min per rounded location.
+
+        Subs that share a region across ticks (or across cadences within
+        one tick) reuse the same Open-Meteo response.
+        """
+        key = (round(lat, 3), round(lon, 3), days, tz_name, units)
+        hit = self._outlook_cache.get(key)
+        if hit is not None and time.monotonic() - hit[1] < 1800:
+            return hit[0]
+        outlook = await _fetch_outlook(session, lat, lon, days=days, tz_name=tz_name, units=units)
+        self._outlook_cache[key] = (outlook, time.monotonic())
+        return outlook
+
     @tasks.loop(seconds=60)
     async def weather_scheduler(self):
         if self.store is None:
             return
         try:
             now_utc = datetime.now(timezone.utc)
-            subs = self.store.list_weather_subs(None)
-            if not subs:
+            # The due filter runs in SQL against the next_run_utc index, so
+            # a quiet tick returns no rows and costs no parsing at all.
+            due = await asyncio.to_thread(self.store.list_weather_subs_due, now_utc.isoformat())
+            if not due:
                 return
-            async with aiohttp.ClientSession(headers=HTTP_HEADERS) as session:
-                for s in subs:
-                    due = datetime.fromisoformat(s["next_run_utc"]).replace(tzinfo=timezone.utc)
-                    if due <= now_utc:
-                        try:
-                            user = await self.bot.fetch_user(int(s["user_id"]))
-                            city, state, lat, lon = await _zip_to_place_and_coords(session, s["zip"])
-                            tz_name = (s.get("tz_name") or "").strip() or _get_user_tz_name(self.store, int(s["user_id"]))
-                            units = (s.get("units") or "").strip().lower() or _get_user_units(self.store, int(s["user_id"]))
-                            if s["cadence"] == "daily":
-                                outlook = await _fetch_outlook(session, lat, lon, days=2, tz_name=tz_name, units=units)
-                                first_hi = outlook[0][5] if outlook and outlook[0][5] is not None else None
-                                first_hi_f = None
-                                if first_hi is not None:
-                                    try:
-                                        first_hi_f = float(first_hi) if units == "standard" else (float(first_hi) * 9.0 / 5.0 + 32.0)
-                                    except Exception:
-                                        first_hi_f = None
-                                emb = discord.Embed(
-                                    title=f"\U0001F324\ufe0f Daily Outlook — {city}, {state} {s['zip']}",
-                                    colour=wx_color_from_temp_f(first_hi_f if first_hi_f is not None else 70)
-                                )
-                                for (d, line, sunrise, sunset, uv, _hi) in outlook:
-                                    extras = []
-                                    if sunrise: extras.append(f"\U0001F305 {fmt_sun(sunrise)}")
-                                    if sunset: extras.append(f"\U0001F307 {fmt_sun(sunset)}")
-                                    if uv is not None: extras.append(f"\U0001F506 UV {round(uv,1)}")
-                                    value = "\n".join([line, " - ".join(extras)]) if extras else line
-                                    emb.add_field(name=d, value=value, inline=False)
-                                emb.set_footer(text=f"Scheduled in {tz_name} • Units: {units}")
-                                await user.send(embed=emb)
-                                tz = _tzinfo_from_name(tz_name)
-                                next_local = datetime.now(tz)
-                                next_local = next_local.replace(hour=s["hh"], minute=s["mi"], second=0, microsecond=0)
-                                if next_local <= datetime.now(tz):
-                                    next_local += timedelta(days=1)
-                                self.store.update_weather_sub(s["id"], user_id=int(s["user_id"]), next_run_utc=next_local.astimezone(timezone.utc).isoformat())
-                            else:
-                                days = int(s.get("weekly_days", 7))
-                                days = 10 if days > 10 else (3 if days < 3 else days)
-                                outlook = await _fetch_outlook(session, lat, lon, days=days, tz_name=tz_name, units=units)
-                                first_hi = outlook[0][5] if outlook and outlook[0][5] is not None else None
-                                first_hi_f = None
-                                if first_hi is not None:
-                                    try:
-                                        first_hi_f = float(first_hi) if units == "standard" else (float(first_hi) * 9.0 / 5.0 + 32.0)
-                                    except Exception:
-                                        first_hi_f = None
-                                emb = discord.Embed(
-                                    title=f"\U0001F5D3\ufe0f Weekly Outlook ({days} days) — {city}, {state} {s['zip']}",
-                                    colour=wx_color_from_temp_f(first_hi_f if first_hi_f is not None else 70)
-                                )
-                                for (d, line, _sunrise, _sunset, _uv, _hi) in outlook:
-                                    emb.add_field(name=d, value=line, inline=False)
-                                emb.set_footer(text=f"Scheduled in {tz_name} • Units: {units}")
-                                await user.send(embed=emb)
-                                tz = _tzinfo_from_name(tz_name)
-                                next_local = datetime.now(tz)
-                                next_local = next_local.replace(hour=s["hh"], minute=s["mi"], second=0, microsecond=0)
-                                if next_local <= datetime.now(tz):
-                                    next_local += timedelta(days=7)
-                                else:
-                                    next_local += timedelta(days=7)
-                                self.store.update_weather_sub(s["id"], user_id=int(s["user_id"]), next_run_utc=next_local.astimezone(timezone.utc).isoformat())
-                        except Exception:
-                            fallback = now_utc + timedelta(minutes=5)
-                            self.store.update_weather_sub(s["id"], next_run_utc=fallback.isoformat())
+            session = await self._session()
+
+            # Group by what actually determines the fetch: one Open-Meteo
+            # call per unique (zip, days, tz, units) instead of one per sub.
+            by_key: Dict[Tuple[str, int, str, str], List[Any]] = {}
+            for s in due:
+                tz_name = (s["tz_name"] or "").strip() or _get_user_tz_name(self.store, int(s["user_id"]))
+                units = (s["units"] or "").strip().lower() or _get_user_units(self.store, int(s["user_id"]))
+                if s["cadence"] == "daily":
+                    days = 2
+                else:
+                    days = int(s["weekly_days"] or 7)
+                    days = 10 if days > 10 else (3 if days < 3 else days)
+                by_key.setdefault((s["zip"], days, tz_name, units), []).append(s)
+
+            sem = asyncio.Semaphore(8)  # bound concurrent Discord sends
+            fetch_sem = asyncio.Semaphore(8)  # and concurrent upstream fetches
+
+            async def _fan_out(key, group):
+                zip_code, days, tz_name, units = key
+                try:
+                    async with fetch_sem:
+                        city, state, lat, lon = await _zip_to_place_and_coords(session, zip_code)
+                        outlook = await self._cached_outlook(session, lat, lon, days, tz_name, units)
+                except Exception:
+                    fallback = (now_utc + timedelta(minutes=5)).isoformat()
+                    return [{"id": s["id"], "next_run_utc": fallback} for s in group]
+                return await asyncio.gather(
+                    *(self._deliver_sub(s, city, state, tz_name, units, outlook, days, now_utc, sem) for s in group),
+                    return_exceptions=True,
+                )
+
+            results = await asyncio.gather(*(_fan_out(k, g) for k, g in by_key.items()), return_exceptions=True)
+            # Every delivery (and every failure path) yields a reschedule;
+            # apply them all in one transaction instead of one per sub.
+            updates = [u for r in results if isinstance(r, list)
+                       for u in r if isinstance(u, dict)]
+            await asyncio.to_thread(self.store.update_weather_subs, updates)
         except Exception:
             pass
 
@@ -989,22 +1260,34 @@ class Weather(commands.Cog):
     async def _fetch_nws_alerts(self, session: aiohttp.ClientSession, lat: float, lon: float):
         url = "https://api.weather.gov/alerts/active"
         params = {"point": f"{lat},{lon}", "status": "actual", "message_type": "alert"}
+        key = (lat, lon)
+        prior = self._nws_etag.get(key)
+        headers = {**HTTP_HEADERS, "If-None-Match": prior[0]} if prior else HTTP_HEADERS
         try:
-            async with session.get(url, params=params, timeout=aiohttp.ClientTimeout(total=12), headers=HTTP_HEADERS) as r:
+            async with session.get(url, params=params, timeout=aiohttp.ClientTimeout(total=12), headers=headers) as r:
+                if r.status == 304 and prior is not None:
+                    # unchanged since last poll: ~200 bytes, no parse
+                    return prior[1]
                 if r.status != 200:
                     return []
-                data = await r.json()
+                # alert feeds run to hundreds of KB; parse with orjson
+                data = _loads(await r.read())
+                etag = r.headers.get("ETag", "")
         except Exception:
             return []
         feats = data.get("features", []) or []
         out = []
         for f in feats:
             p = f.get("properties", {}) or {}
+            sev = (p.get("severity") or "").lower()
             out.append({
                 "id": p.get("id") or f.get("id"),
                 "event": p.get("event"),
                 "headline": p.get("headline"),
-                "severity": (p.get("severity") or "").lower(),
+                "severity": sev,
+                # ranked once here; the per-user filter loop runs over the
+                # same alert list many times when users share a region
+                "_rank": NWS_SEV_MAP.get(sev, 0),
                 "certainty": (p.get("certainty") or "").lower(),
                 "urgency": (p.get("urgency") or "").lower(),
                 "areas": p.get("areaDesc"),
@@ -1015,6 +1298,8 @@ class Weather(commands.Cog):
                 "sender": p.get("senderName"),
                 "link":  p.get("uri"),
             })
+        if etag:
+            self._nws_etag[key] = (etag, out)
         return out
 
     @tasks.loop(seconds=300)
@@ -1022,73 +1307,106 @@ class Weather(commands.Cog):
         if self.store is None:
             return
         try:
-            user_ids = set()
-            try:
-                for s in self.store.list_weather_subs(None):
-                    user_ids.add(int(s.get("user_id")))
-            except Exception:
-                pass
-            try:
-                rows = self.store.db.execute("SELECT user_id FROM weather_zips").fetchall()
-                user_ids |= {int(r[0]) for r in rows}
-            except Exception:
-                pass
-            if not user_ids:
+            # Sweep week-old seen-markers at most once a day so the notes
+            # table doesn't grow one row per alert forever, and run the
+            # store's WAL-checkpoint/optimize upkeep on the same cadence.
+            if time.monotonic() - self._last_prune > 86400:
+                self._last_prune = time.monotonic()
+                await asyncio.to_thread(self.store.prune_alert_seen, int(time.time()) - 7 * 86400)
+                await asyncio.to_thread(self.store.maintenance)
+
+            # One query returns every enabled user with their ZIP and
+            # severity floor — the old flow was two table scans plus three
+            # get_note round trips per candidate user.
+            rows = await asyncio.to_thread(self.store.list_alert_enabled_users)
+
+            # Group by ZIP so api.weather.gov is hit once per region
+            # instead of once per user (many users share a ZIP, and the
+            # feed is identical).
+            zip_to_users: Dict[str, List[Tuple[int, str]]] = {}
+            for r in rows:
+                z = r.get("zip") or ""
+                if len(z) != 5:
+                    continue
+                zip_to_users.setdefault(z, []).append((int(r["user_id"]), r.get("min_sev") or "watch"))
+            if not zip_to_users:
+                return
+
+            session = await self._session()
+            sem = asyncio.Semaphore(8)  # bound concurrent Discord sends
+
+            async def _process_group(z, users):
+                try:
+                    city, state, lat, lon = await _zip_to_place_and_coords(session, z)
+                    alerts = await self._alerts_for_point(session, lat, lon)
+                except Exception:
+                    return
+                await asyncio.gather(
+                    *(self._notify_user_alerts(uid, min_sev, z, city, state, alerts, sem) for uid, min_sev in users),
+                    return_exceptions=True,
+                )
+
+            await asyncio.gather(*(_process_group(z, u) for z, u in zip_to_users.items()), return_exceptions=True)
+        except Exception:
+            pass
+
+    async def _alerts_for_point(self, session: aiohttp.ClientSession, lat: float, lon: float):
+        """Fetch NWS alerts with a short TTL cache on a coarse lat/lon bucket.
+
+        Rounding to one decimal (~11 km) also dedupes nearby ZIPs that
+        resolve to effectively the same NWS grid point.
+        """
+        key = (round(lat, 1), round(lon, 1))
+        hit = self._alerts_cache.get(key)
+        if hit is not None and time.monotonic() - hit[1] < 120:
+            return hit[0]
+        alerts = await self._fetch_nws_alerts(session, lat, lon)
+        self._alerts_cache[key] = (alerts, time.monotonic())
+        return alerts
+
+    async def _notify_user_alerts(self, uid: int, min_sev: str, z: str, city: str, state: str, alerts: list, sem: asyncio.Semaphore):
+        """Apply one user's severity/seen filters to a region's alerts and DM them."""
+        try:
+            min_rank = SEVERITY_ORDER.get(min_sev, 1)
+
+            # One SELECT for every candidate alert's seen-marker instead of
+            # a DB round trip per (user, alert).
+            candidates = [a for a in alerts if a["_rank"] >= min_rank and a.get("id")]
+            seen = await asyncio.to_thread(
+                self.store.get_seen_alert_ids, uid, [a["id"] for a in candidates]
+            )
+            fresh = [a for a in candidates if a["id"] not in seen]
+
+            if not fresh:
                 return
 
-            async with aiohttp.ClientSession(headers=HTTP_HEADERS) as session:
-                for uid in user_ids:
-                    if self.store.get_note(uid, "wx_alerts_enabled") != "1":
-                        continue
-                    z = self.store.get_note(uid, "wx_alerts_zip") or (self.store.get_user_zip(uid) or "")
-                    if len(z) != 5:
-                        continue
-                    try:
-                        city, state, lat, lon = await _zip_to_place_and_coords(session, z)
-                        alerts = await self._fetch_nws_alerts(session, lat, lon)
-                        min_sev = self.store.get_note(uid, "wx_alerts_min_sev") or "watch"
-                        min_rank = SEVERITY_ORDER.get(min_sev, 1)
-
-                        fresh = []
-                        for a in alerts:
-                            rank = NWS_SEV_MAP.get(a.get("severity",""), 0)
-                            if rank < min_rank:
-                                continue
-                            aid = a.get("id") or ""
-                            if not aid:
-                                continue
-                            if self.store.get_note(uid, _seen_key(uid, aid)):
-                                continue
-                            fresh.append(a)
-
-                        if not fresh:
-                            continue
-
-                        emb = discord.Embed(
-                            title=f"\u26A0\ufe0f Weather Alerts — {city}, {state} {z}",
-                            colour=discord.Colour.orange()
-                        )
-                        for a in fresh[:10]:
-                            name = f"{a.get('event') or 'Alert'} ({(a.get('severity') or '').title()})"
-                            when = ""
-                            if a.get("starts"): when += f"Starts: {a['starts']}\n"
-                            if a.get("ends"):   when += f"Ends: {a['ends']}\n"
-                            body = (a.get("headline") or a.get("desc") or "Details unavailable").strip()
-                            if len(body) > 400: body = body[:397] + "…"
-                            tail = f"\n{when}Source: {a.get('sender') or 'NWS'}"
-                            if a.get("link"): tail += f"\nMore: {a['link']}"
-                            emb.add_field(name=name, value=f"{body}{tail}", inline=False)
-
-                        user = await self.bot.fetch_user(uid)
-                        await user.send(embed=emb)
-                        # mark seen
-                        for a in fresh:
-                            aid = a.get("id")
-                            if aid:
-                                self.store.set_note(uid, _seen_key(uid, aid), "1")
-
-                    except Exception:
-                        continue
+            emb = discord.Embed(
+                title=f"\u26A0\ufe0f Weather Alerts — {city}, {state} {z}",
+                colour=discord.Colour.orange()
+            )
+            # Embeds cap at 10 fields; take the most severe ones rather than
+            # the first 10 in feed order (O(n log 10), no slice copy).
+            for a in heapq.nlargest(10, fresh, key=lambda a: a["_rank"]):
+                name = f"{a.get('event') or 'Alert'} ({(a.get('severity') or '').title()})"
+                body = (a.get("headline") or a.get("desc") or "Details unavailable").strip()
+                if len(body) > 400: body = body[:397] + "…"
+                # one join, no intermediate += strings
+                parts = [body]
+                if a.get("starts"): parts.append(f"Starts: {a['starts']}")
+                if a.get("ends"):   parts.append(f"Ends: {a['ends']}")
+                parts.append(f"Source: {a.get('sender') or 'NWS'}")
+                if a.get("link"): parts.append(f"More: {a['link']}")
+                emb.add_field(name=name, value="\n".join(parts), inline=False)
+
+            async with sem:
+                user = await self._get_user(uid)
+                await user.send(embed=emb)
+            # mark seen, one transaction for the batch; seen_at lets the
+            # daily sweep prune by age
+            await asyncio.to_thread(
+                self.store.mark_alerts_seen, uid, [a["id"] for a in fresh], int(time.time())
+            )
+
         except Exception:
             pass
 
@@ -1,16 +1,120 @@
+import asyncio
 import os
 import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
 from typing import Optional, Dict, Any, List
 
+# Hot single-key reads (tz/units notes, saved ZIPs) are re-queried on
+# nearly every command; a short TTL keeps them out of SQLite without
+# risking staleness, and writers drop their own entries immediately.
+_READ_TTL = 60.0
+_READ_CAP = 4096
+
+# RETURNING needs SQLite 3.35+ (2021); older libs fall back to lastrowid.
+_HAS_RETURNING = sqlite3.sqlite_version_info >= (3, 35, 0)
+
 
 class WxStore:
-    """Tiny SQLite-backed store for weather preferences and schedules."""
+    """Tiny SQLite-backed store for weather preferences and schedules.
+
+    Keeps one connection per thread (``self.db`` resolves lazily through a
+    ``threading.local``): store calls run via asyncio.to_thread, and a
+    single shared connection would serialize them all on sqlite3's
+    internal mutex. Under WAL, per-thread connections let readers proceed
+    in parallel with the writer. Shared across every cog via ``bot.store``;
+    use as an async context manager so open/close happen off the event
+    loop and close is guaranteed on shutdown::
+
+        async with WxStore(path) as store:
+            bot.store = store
+            ...
+    """
 
     def __init__(self, db_path: str = "data/wxbot.sqlite3"):
-        os.makedirs(os.path.dirname(db_path), exist_ok=True)
-        self.db = sqlite3.connect(db_path, check_same_thread=False)
-        self.db.row_factory = sqlite3.Row
-        self._init_schema()
+        self.db_path = db_path
+        self._local = threading.local()
+        self._conns: List[sqlite3.Connection] = []
+        self._conns_lock = threading.Lock()
+        self._opened = False
+        # LRU of hot reads: key -> (value, monotonic deadline). Shared by
+        # every worker thread, so ops hold a lock — OrderedDict reordering
+        # is not atomic under concurrent eviction.
+        self._read_cache: OrderedDict = OrderedDict()
+        self._read_cache_lock = threading.Lock()
+
+    @property
+    def db(self) -> sqlite3.Connection:
+        """This thread's connection, opened (and tuned) on first use."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._connect()
+        return conn
+
+    def _connect(self) -> sqlite3.Connection:
+        # cached_statements above the default so the full working set of
+        # parameterized queries stays compiled across scheduler ticks.
+        conn = sqlite3.connect(self.db_path, check_same_thread=False, cached_statements=256)
+        conn.row_factory = sqlite3.Row
+        self._local.conn = conn
+        self._tune_pragmas(conn)
+        with self._conns_lock:
+            self._conns.append(conn)
+        return conn
+
+    def _cache_get(self, ck):
+        with self._read_cache_lock:
+            hit = self._read_cache.get(ck)
+            if hit is not None and hit[1] > time.monotonic():
+                self._read_cache.move_to_end(ck)
+                return hit
+        return None
+
+    def _cache_put(self, ck, value) -> None:
+        with self._read_cache_lock:
+            self._read_cache[ck] = (value, time.monotonic() + _READ_TTL)
+            self._read_cache.move_to_end(ck)
+            if len(self._read_cache) > _READ_CAP:
+                self._read_cache.popitem(last=False)
+
+    def _cache_drop(self, ck) -> None:
+        with self._read_cache_lock:
+            self._read_cache.pop(ck, None)
+
+    def open(self):
+        """Open the first connection and create/migrate the schema (blocking)."""
+        if self._opened:
+            return self
+        os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
+        self._init_schema()  # touching self.db opens this thread's connection
+        self._opened = True
+        return self
+
+    async def __aenter__(self) -> "WxStore":
+        await asyncio.to_thread(self.open)
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        await asyncio.to_thread(self.close)
+
+    def _tune_pragmas(self, conn: sqlite3.Connection):
+        # WAL lets readers proceed while a write is in flight, and
+        # synchronous=NORMAL drops the per-commit fsync (safe under WAL).
+        # The rest is cache/temp tuning for a small, hot database.
+        # Applied per connection; WAL itself persists in the database file.
+        try:
+            cur = conn.cursor()
+            cur.execute("PRAGMA journal_mode=WAL")
+            cur.execute("PRAGMA synchronous=NORMAL")
+            cur.execute("PRAGMA mmap_size=67108864")
+            cur.execute("PRAGMA cache_size=-8192")
+            cur.execute("PRAGMA temp_store=MEMORY")
+            cur.execute("PRAGMA busy_timeout=5000")
+        except Exception:
+            # Best-effort: an old SQLite without WAL still works, just slower
+            pass
 
     def _init_schema(self):
         cur = self.db.cursor()
@@ -42,6 +146,18 @@ class WxStore:
         )
         cur.execute("CREATE INDEX IF NOT EXISTS idx_weather_subs_next ON weather_subs(next_run_utc)")
         cur.execute("CREATE INDEX IF NOT EXISTS idx_weather_subs_user ON weather_subs(user_id)")
+        # Seed planner stats so the indexes above are picked from the first
+        # query; PRAGMA optimize at close keeps them fresh afterwards.
+        cur.execute("ANALYZE")
+
+        cur.execute(
+            """
+            CREATE TABLE IF NOT EXISTS kv (
+                key TEXT PRIMARY KEY,
+                value TEXT NOT NULL
+            )
+            """
+        )
 
         cur.execute(
             """
@@ -54,6 +170,17 @@ class WxStore:
             """
         )
 
+        cur.execute(
+            """
+            CREATE TABLE IF NOT EXISTS alerts_seen (
+                user_id INTEGER NOT NULL,
+                alert_id TEXT NOT NULL,
+                seen_at INTEGER NOT NULL,
+                PRIMARY KEY (user_id, alert_id)
+            )
+            """
+        )
+
         self.db.commit()
 
         # ---- Lightweight migrations (older DBs) ----
@@ -68,11 +195,49 @@ class WxStore:
             # Best-effort: if migration fails, bot still runs with defaults
             pass
 
+    @contextmanager
+    def transaction(self):
+        """Group several writes into one commit; rolls back on error.
+
+        The batch helpers below use this so a bad row never leaves a
+        half-applied batch behind, and callers can compose their own
+        multi-statement transactions the same way. Single-row setters
+        called inside the block defer to the enclosing commit (one fsync
+        for the whole batch) instead of committing mid-transaction.
+        """
+        db = self.db  # one thread, one connection, one transaction
+        db.execute("BEGIN IMMEDIATE")
+        self._local.in_txn = True
+        try:
+            yield db
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            self._local.in_txn = False
+
+    def _commit(self) -> None:
+        """Commit unless a transaction() block owns the commit."""
+        if not getattr(self._local, "in_txn", False):
+            self.db.commit()
+
     def get_user_zip(self, user_id: int) -> Optional[str]:
-        row = self.db.execute("SELECT zip FROM weather_zips WHERE user_id = ?", (int(user_id),)).fetchone()
-        return row["zip"] if row else None
+        ck = ("zip", int(user_id))
+        hit = self._cache_get(ck)
+        if hit is not None:
+            return hit[0]
+        # Single-column read: a plain-tuple cursor skips sqlite3.Row's
+        # per-row column-name setup on this hot path.
+        cur = self.db.cursor()
+        cur.row_factory = None
+        row = cur.execute("SELECT zip FROM weather_zips WHERE user_id = ?", (int(user_id),)).fetchone()
+        value = row[0] if row else None
+        self._cache_put(ck, value)
+        return value
 
     def set_user_zip(self, user_id: int, zip_code: str) -> None:
+        self._cache_drop(("zip", int(user_id)))
         self.db.execute(
             """
             INSERT INTO weather_zips(user_id, zip) VALUES (?, ?)
@@ -80,43 +245,79 @@ class WxStore:
             """,
             (int(user_id), str(zip_code)),
         )
-        self.db.commit()
+        self._commit()
 
     def add_weather_sub(self, sub: Dict[str, Any]) -> int:
-        cur = self.db.cursor()
-        cur.execute(
-            """
+        params = (
+            int(sub["user_id"]),
+            str(sub["zip"]),
+            str(sub["cadence"]),
+            int(sub["hh"]),
+            int(sub["mi"]),
+            int(sub.get("weekly_days") or 0),
+            str(sub.get("tz_name") or ""),
+            str(sub.get("units") or ""),
+            str(sub["next_run_utc"]),
+        )
+        insert_sql = """
             INSERT INTO weather_subs(user_id, zip, cadence, hh, mi, weekly_days, tz_name, units, next_run_utc)
             VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """,
-            (
-                int(sub["user_id"]),
-                str(sub["zip"]),
-                str(sub["cadence"]),
-                int(sub["hh"]),
-                int(sub["mi"]),
-                int(sub.get("weekly_days") or 0),
-                str(sub.get("tz_name") or ""),
-                str(sub.get("units") or ""),
-                str(sub["next_run_utc"]),
-            ),
-        )
-        self.db.commit()
+            """
+        if _HAS_RETURNING:
+            row = self.db.execute(insert_sql + " RETURNING id", params).fetchone()
+            self._commit()
+            return int(row["id"])
+        cur = self.db.cursor()
+        cur.execute(insert_sql, params)
+        self._commit()
         return int(cur.lastrowid)
 
-    def list_weather_subs(self, user_id: Optional[int] = None) -> List[Dict[str, Any]]:
-        """List subscriptions. If user_id is None, returns all subs."""
+    def add_weather_subs(self, subs: List[Dict[str, Any]]) -> None:
+        """Insert many subs through one prepared statement and one commit.
+
+        For bulk seeding/imports where the new ids aren't needed; use
+        add_weather_sub when the caller wants the row id back.
+        """
+        if not subs:
+            return
+        with self.transaction():
+            self.db.executemany(
+                """
+                INSERT INTO weather_subs(user_id, zip, cadence, hh, mi, weekly_days, tz_name, units, next_run_utc)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                (
+                    (
+                        int(s["user_id"]),
+                        str(s["zip"]),
+                        str(s["cadence"]),
+                        int(s["hh"]),
+                        int(s["mi"]),
+                        int(s.get("weekly_days") or 0),
+                        str(s.get("tz_name") or ""),
+                        str(s.get("units") or ""),
+                        str(s["next_run_utc"]),
+                    )
+                    for s in subs
+                ),
+            )
+
+    def list_weather_subs(self, user_id: Optional[int] = None) -> List[sqlite3.Row]:
+        """List subscriptions. If user_id is None, returns all subs.
+
+        Returns sqlite3.Row objects — name-indexable without the per-row
+        dict copy, and every column is selected explicitly.
+        """
         if user_id is None:
-            rows = self.db.execute(
+            return self.db.execute(
                 """
                 SELECT id, user_id, zip, cadence, hh, mi, weekly_days, tz_name, units, next_run_utc
                 FROM weather_subs
                 ORDER BY next_run_utc ASC
                 """
             ).fetchall()
-            return [dict(r) for r in rows]
 
-        rows = self.db.execute(
+        return self.db.execute(
             """
             SELECT id, user_id, zip, cadence, hh, mi, weekly_days, tz_name, units, next_run_utc
             FROM weather_subs
@@ -125,7 +326,26 @@ class WxStore:
             """,
             (int(user_id),),
         ).fetchall()
-        return [dict(r) for r in rows]
+
+    def list_weather_subs_due(self, now_iso: str) -> List[sqlite3.Row]:
+        """Subscriptions due at or before now_iso (UTC ISO-8601).
+
+        All writers store next_run_utc as UTC isoformat, which compares
+        lexicographically in timestamp order — so the filter runs in SQL
+        against the next_run_utc index and only due rows come back.
+
+        Returns sqlite3.Row objects (mapping-style ``row["col"]`` access);
+        every column is selected explicitly, so callers don't need .get().
+        """
+        return self.db.execute(
+            """
+            SELECT id, user_id, zip, cadence, hh, mi, weekly_days, tz_name, units, next_run_utc
+            FROM weather_subs
+            WHERE next_run_utc <= ?
+            ORDER BY next_run_utc ASC
+            """,
+            (str(now_iso),),
+        ).fetchall()
 
     def remove_weather_sub(self, sub_id: int, requester_id: int) -> bool:
         """Remove a subscription by ID, only if it belongs to requester_id."""
@@ -134,21 +354,137 @@ class WxStore:
             "DELETE FROM weather_subs WHERE id = ? AND user_id = ?",
             (int(sub_id), int(requester_id)),
         )
-        self.db.commit()
+        self._commit()
         return cur.rowcount > 0
 
     def update_weather_sub(self, sub_id: int, next_run_utc: str, **_ignored) -> None:
         self.db.execute("UPDATE weather_subs SET next_run_utc = ? WHERE id = ?", (str(next_run_utc), int(sub_id)))
-        self.db.commit()
+        self._commit()
+
+    def update_weather_subs(self, items: List[Dict[str, Any]]) -> None:
+        """Reschedule many subs in one transaction.
+
+        items: [{"id": sub_id, "next_run_utc": iso_str}, ...] — one commit
+        instead of a write+fsync per row.
+        """
+        if not items:
+            return
+        with self.transaction():
+            self.db.executemany(
+                "UPDATE weather_subs SET next_run_utc = ? WHERE id = ?",
+                [(str(i["next_run_utc"]), int(i["id"])) for i in items],
+            )
+
+    def list_alert_enabled_users(self) -> List[Dict[str, Any]]:
+        """Users with weather alerts enabled, with their ZIP and min severity.
+
+        One query replaces the scheduler's old per-user get_note round
+        trips: the alert settings are pivoted out of notes with
+        conditional aggregation and disabled users are filtered in SQL.
+        Candidates come from notes itself — the enabled flag only ever
+        lives there, so that's the authoritative set (a user who turned
+        alerts on with an explicit ZIP may have no sub or saved ZIP).
+        """
+        rows = self.db.execute(
+            """
+            SELECT n.user_id AS user_id,
+                   COALESCE(
+                       MAX(CASE WHEN n.key = 'wx_alerts_zip' THEN n.value END),
+                       (SELECT zip FROM weather_zips wz WHERE wz.user_id = n.user_id)
+                   ) AS zip,
+                   COALESCE(MAX(CASE WHEN n.key = 'wx_alerts_min_sev' THEN n.value END), 'watch') AS min_sev
+            FROM notes n
+            GROUP BY n.user_id
+            HAVING MAX(CASE WHEN n.key = 'wx_alerts_enabled' THEN n.value END) = '1'
+            """
+        ).fetchall()
+        return [dict(r) for r in rows]
+
+    def get_seen_alert_ids(self, user_id: int, alert_ids: List[str]) -> set:
+        """Which of alert_ids this user has already been notified about."""
+        if not alert_ids:
+            return set()
+        ph = ",".join("?" * len(alert_ids))
+        rows = self.db.execute(
+            f"SELECT alert_id FROM alerts_seen WHERE user_id = ? AND alert_id IN ({ph})",
+            (int(user_id), *[str(a) for a in alert_ids]),
+        ).fetchall()
+        return {r["alert_id"] for r in rows}
+
+    def mark_alerts_seen(self, user_id: int, alert_ids: List[str], seen_at: int) -> None:
+        """Record delivered alerts in one transaction."""
+        if not alert_ids:
+            return
+        with self.transaction():
+            self.db.executemany(
+                "INSERT OR IGNORE INTO alerts_seen(user_id, alert_id, seen_at) VALUES (?, ?, ?)",
+                [(int(user_id), str(a), int(seen_at)) for a in alert_ids],
+            )
+
+    def prune_alert_seen(self, before_ts: int) -> int:
+        """Delete alert seen-markers older than before_ts (epoch secs).
+
+        Also sweeps legacy markers that lived in the notes table before
+        alerts_seen existed. Keeps storage from growing one row per alert
+        forever; the (user_id, alert_id) primary key indexes the lookups.
+        """
+        with self.transaction():
+            cur = self.db.execute("DELETE FROM alerts_seen WHERE seen_at < ?", (int(before_ts),))
+            n = cur.rowcount
+            cur = self.db.execute(
+                "DELETE FROM notes WHERE key LIKE 'wx_seen:%' AND CAST(value AS INTEGER) < ?",
+                (int(before_ts),),
+            )
+        return n + cur.rowcount
+
+    def get_kv(self, key: str) -> Optional[str]:
+        row = self.db.execute("SELECT value FROM kv WHERE key = ?", (str(key),)).fetchone()
+        return row["value"] if row else None
+
+    def set_kv(self, key: str, value: str) -> None:
+        self.db.execute(
+            """
+            INSERT INTO kv(key, value) VALUES (?, ?)
+            ON CONFLICT(key) DO UPDATE SET value = excluded.value
+            """,
+            (str(key), str(value)),
+        )
+        self._commit()
 
     def get_note(self, user_id: int, key: str) -> Optional[str]:
-        row = self.db.execute(
+        ck = ("note", int(user_id), str(key))
+        hit = self._cache_get(ck)
+        if hit is not None:
+            return hit[0]
+        # Same plain-tuple cursor trick as get_user_zip: one column out,
+        # no named access needed.
+        cur = self.db.cursor()
+        cur.row_factory = None
+        row = cur.execute(
             "SELECT value FROM notes WHERE user_id = ? AND key = ?",
             (int(user_id), str(key)),
         ).fetchone()
-        return row["value"] if row else None
+        value = row[0] if row else None
+        self._cache_put(ck, value)
+        return value
+
+    def set_notes_bulk(self, user_id: int, items: List[tuple]) -> None:
+        """Upsert many (key, value) notes for one user in one transaction."""
+        if not items:
+            return
+        for k, _v in items:
+            self._cache_drop(("note", int(user_id), str(k)))
+        with self.transaction():
+            self.db.executemany(
+                """
+                INSERT INTO notes(user_id, key, value) VALUES (?, ?, ?)
+                ON CONFLICT(user_id, key) DO UPDATE SET value = excluded.value
+                """,
+                [(int(user_id), str(k), str(v)) for k, v in items],
+            )
 
     def set_note(self, user_id: int, key: str, value: str) -> None:
+        self._cache_drop(("note", int(user_id), str(key)))
         self.db.execute(
             """
             INSERT INTO notes(user_id, key, value) VALUES (?, ?, ?)
@@ -156,10 +492,35 @@ class WxStore:
             """,
             (int(user_id), str(key), str(value)),
         )
-        self.db.commit()
+        self._commit()
+
+    def maintenance(self) -> None:
+        """Periodic upkeep: checkpoint the WAL and refresh planner stats.
+
+        Safe to call from a timer; both pragmas are cheap when there is
+        nothing to do.
+        """
+        try:
+            self.db.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+            self.db.execute("PRAGMA optimize")
+        except Exception:
+            pass
 
     def close(self):
+        if not self._opened:
+            return
         try:
-            self.db.close()
+            # One last optimize so collected stats survive to the next run
+            # (per the SQLite docs' close-time recommendation).
+            self.db.execute("PRAGMA optimize")
         except Exception:
             pass
+        with self._conns_lock:
+            conns, self._conns = self._conns, []
+        for conn in conns:
+            try:
+                conn.close()
+            except Exception:
+                pass
+        self._local = threading.local()
+        self._opened = False